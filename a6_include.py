@@ -5,6 +5,13 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:     # batch hashing falls back to the scalar functions
+    np = None
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -78,6 +85,18 @@ class DynamicArray:
         return len(self._data)
 
 
+def raw_buffer(da: DynamicArray) -> list:
+    """
+    Return the list backing a dynamic array, so that the hash map internals
+    can read and write its elements in their hot loops without the checked
+    [] access, which goes through get_at_index() and length() each time.
+    Callers must only use indices already known to be in range (a hash map
+    reduces them modulo its capacity, the length of its table), and must
+    not change the length of the list.
+    """
+    return da._data
+
+
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
     hash = 0
@@ -96,6 +115,84 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# Longest key hashed with NumPy; beyond this hash_function_2 could overflow
+# a 64-bit integer, so the batch falls back to the scalar function.
+_MAX_BATCH_KEY_LENGTH = 2 ** 21
+
+
+def _code_points(keys: list):
+    """
+    Encode a list of string keys into one contiguous array of code points.
+    Return the array and the start offset and length of each key, or None
+    if the batch can not be hashed with NumPy.
+    """
+    if np is None or not all(type(key) is str for key in keys):
+        return None
+    lengths = np.fromiter((len(key) for key in keys), dtype=np.int64, count=len(keys))
+    if lengths.size and lengths.max() > _MAX_BATCH_KEY_LENGTH:
+        return None
+    buffer = ''.join(keys).encode('utf-32-le', 'surrogatepass')
+    points = np.frombuffer(buffer, dtype=np.uint32).astype(np.int64)
+    starts = np.cumsum(lengths) - lengths
+    return points, starts, lengths
+
+
+def _segment_sums(values, starts, lengths) -> list:
+    """Sum each [start, start + length) segment of values."""
+    sums = np.zeros(lengths.size, dtype=np.int64)
+    nonempty = lengths > 0
+    if nonempty.any():
+        sums[nonempty] = np.add.reduceat(values, starts[nonempty])
+    return sums.tolist()
+
+
+def hash_function_1_batch(keys: list) -> list:
+    """
+    Batch version of hash_function_1. Returns the list of hashes of the
+    given keys, computed in one vectorized pass when NumPy is available.
+    """
+    encoded = _code_points(keys)
+    if encoded is None:
+        return [hash_function_1(key) for key in keys]
+    points, starts, lengths = encoded
+    return _segment_sums(points, starts, lengths)
+
+
+def hash_function_2_batch(keys: list) -> list:
+    """
+    Batch version of hash_function_2. Returns the list of hashes of the
+    given keys, computed as a position-weighted segment sum in one
+    vectorized pass when NumPy is available.
+    """
+    encoded = _code_points(keys)
+    if encoded is None:
+        return [hash_function_2(key) for key in keys]
+    points, starts, lengths = encoded
+    weights = np.arange(1, points.size + 1) - np.repeat(starts, lengths)
+    return _segment_sums(points * weights, starts, lengths)
+
+
+# Batch versions of the sample hash functions, used by batch_hash().
+_BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+}
+
+
+def batch_hash(function, keys: list) -> list:
+    """
+    Return the list of hashes of the given keys under the given hash
+    function, using its batch version if it has one: a sample function's,
+    or the one a function carries as its batch attribute.
+    """
+    batch_function = _BATCH_HASH_FUNCTIONS.get(function)
+    if batch_function is None:
+        batch_function = getattr(function, 'batch', None)
+    if batch_function is None:
+        return [function(key) for key in keys]
+    return batch_function(keys)
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +200,13 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """Initialize node given a key, value and (optionally) its full hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -141,9 +240,13 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, remove, contains, move_to_front,
+    transpose, probe, length, iterator
     """
 
+    # Class of the nodes created by insert().
+    _node_type = SLNode
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,20 +271,22 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = self._node_type(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
         Return True if removal was successful, False otherwise.
+        If the hash of the key is given, nodes caching a different hash
+        are skipped without comparing their keys.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,32 +297,211 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If the hash of the key is given, nodes caching a different hash
+        are skipped without comparing their keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
 
+    def move_to_front(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match, like contains().
+        The node found is moved to the front of the list.
+        """
+        previous, node = None, self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                if previous:
+                    previous.next = node.next
+                    node.next = self._head
+                    self._head = node
+                return node
+            previous, node = node, node.next
+        return node
+
+    def transpose(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match, like contains().
+        The node found is swapped with the node before it.
+        """
+        before, previous, node = None, None, self._head
+        while node:
+            if (hash is None or node.hash == hash) and node.key == key:
+                if previous:
+                    previous.next = node.next
+                    node.next = previous
+                    if before:
+                        before.next = node
+                    else:
+                        self._head = node
+                return node
+            before, previous, node = previous, node, node.next
+        return node
+
+    def probe(self, key: str, hash: int = None, policy: str = None) -> tuple:
+        """
+        Return node with matching key (or None if no match) and the number
+        of nodes compared, in a single walk of the list. If policy is
+        'move_to_front' or 'transpose', the node found is moved like the
+        method of that name does.
+        """
+        before, previous, node = None, None, self._head
+        compared = 0
+        while node:
+            compared += 1
+            if (hash is None or node.hash == hash) and node.key == key:
+                if previous and policy == 'move_to_front':
+                    previous.next = node.next
+                    node.next = self._head
+                    self._head = node
+                elif previous and policy == 'transpose':
+                    previous.next = node.next
+                    node.next = previous
+                    if before:
+                        before.next = node
+                    else:
+                        self._head = node
+                return node, compared
+            before, previous, node = previous, node, node.next
+        return node, compared
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
 
 
+class SortedBucket:
+    """
+    Class implementing a bucket for a long chain, as an array of nodes
+    sorted by (hash, key), so that keys are found by binary search.
+    Supported methods are the same as LinkedList's (the hash of the key
+    is required): insert, remove, contains, probe, length, iterator
+    """
+
+    # Class of the nodes created by insert().
+    _node_type = SLNode
+
+    def __init__(self, nodes=None) -> None:
+        """
+        Initialize new bucket, holding the given nodes (or a list of them)
+        if any. Every node must cache the hash of its key.
+        """
+        self._nodes = sorted(nodes or (), key=lambda node: (node.hash, node.key))
+        self._order = [(node.hash, node.key) for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SB [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in (hash, key) order."""
+        return iter(self._nodes)
+
+    def _position(self, key: str, hash: int) -> int:
+        """Return the index of the node with matching key, or -1 if none."""
+        i = bisect_left(self._order, (hash, key))
+        if i < len(self._order) and self._order[i] == (hash, key):
+            return i
+        return -1
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Insert new node at its place in (hash, key) order."""
+        i = bisect_left(self._order, (hash, key))
+        self._order.insert(i, (hash, key))
+        self._nodes.insert(i, self._node_type(key, value, None, hash))
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        i = self._position(key, hash)
+        if i == -1:
+            return False
+        del self._order[i]
+        del self._nodes[i]
+        return True
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match"""
+        i = self._position(key, hash)
+        return self._nodes[i] if i != -1 else None
+
+    def probe(self, key: str, hash: int, policy: str = None) -> tuple:
+        """
+        Return node with matching key (or None if no match) and the number
+        of nodes compared by the binary search. The nodes stay in order, so
+        the policy is ignored.
+        """
+        order, target = self._order, (hash, key)
+        low, high = 0, len(order)
+        compared = 0
+        while low < high:
+            middle = (low + high) // 2
+            compared += 1
+            if order[middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and order[low] == target:
+            return self._nodes[low], compared
+        return None, compared
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
         """Initialize an entry for use in a hash map."""
         self.key = key
         self.value = value
 
+        # Full hash of the key, cached so a resize does not rehash it
+        self.hash = hash
+
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ------ Slotted versions, for HashMaps built with slotted=True ------ #
+
+def _slotted(cls, slots: tuple, **attributes) -> type:
+    """
+    Return a copy of the class whose instances keep their attributes in
+    the given __slots__ instead of a per-instance __dict__. The copy shares
+    the methods of the class; keyword arguments override class attributes.
+
+    The copy is not a subclass of the class, as its instances would then
+    inherit the __dict__ of the class and save no memory, so they do not
+    pass isinstance() checks for it: a hash map built with slotted=True
+    selects the slotted classes explicitly.
+    """
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in ('__dict__', '__weakref__')}
+    namespace.update(attributes)
+    namespace['__slots__'] = slots
+    namespace['__qualname__'] = 'Slotted' + cls.__name__
+    return type('Slotted' + cls.__name__, cls.__bases__, namespace)
+
+
+SlottedDynamicArray = _slotted(DynamicArray, ('_data',))
+SlottedSLNode = _slotted(SLNode, ('key', 'value', 'next', 'hash'))
+SlottedLinkedList = _slotted(LinkedList, ('_head', '_size'), _node_type=SlottedSLNode)
+SlottedSortedBucket = _slotted(SortedBucket, ('_nodes', '_order'), _node_type=SlottedSLNode)
+SlottedHashEntry = _slotted(HashEntry, ('key', 'value', 'hash', 'is_tombstone'))
@@ -0,0 +1,4 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Reproducible benchmarks for the HashMaps (SC & OA), with the
+#              built-in dict as a baseline. Run with `python -m bench`.
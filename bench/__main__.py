@@ -0,0 +1,73 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Command line entry point for the benchmarks:
+#
+#              python -m bench --size 5000 --output results.json
+#              python -m bench --baseline results.json
+#
+#              Prints a table of the results, optionally writes them as JSON,
+#              and compares throughput against a previous JSON run.
+
+import argparse
+import json
+
+from bench.runner import run
+from bench.targets import TARGETS
+from bench.workloads import WORKLOADS
+
+ALL_WORKLOADS = list(WORKLOADS) + ['find_mode']
+
+
+def _print_table(report: dict, baseline: dict = None) -> None:
+    """Print the results, with the speedup over the baseline if given."""
+    previous = {}
+    if baseline is not None:
+        for result in baseline['results']:
+            previous[result['target'], result['workload']] = result['ops_per_sec']
+
+    print(f"{'workload':<12} {'target':<26} {'ops/sec':>12} {'p50 ns':>9} "
+          f"{'p99 ns':>9} {'peak KiB':>9}" + ('  vs baseline' if previous else ''))
+    for result in report['results']:
+        latency = result['latency_ns']
+        line = (f"{result['workload']:<12} {result['target']:<26} "
+                f"{result['ops_per_sec']:>12,.0f} {latency['p50']:>9} "
+                f"{latency['p99']:>9} {result['peak_bytes'] / 1024:>9,.0f}")
+        before = previous.get((result['target'], result['workload']))
+        if before:
+            line += f"  {result['ops_per_sec'] / before:>10.2f}x"
+        print(line)
+
+
+def main() -> None:
+    """Parse the command line, run the benchmarks and report."""
+    parser = argparse.ArgumentParser(
+        prog='python -m bench',
+        description='Benchmark the SC and OA HashMaps against the built-in dict.')
+    parser.add_argument('--size', type=int, default=5000,
+                        help='number of keys (and operations) per workload')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per benchmark; the best is kept')
+    parser.add_argument('--seed', type=int, default=261)
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS),
+                        default=list(TARGETS))
+    parser.add_argument('--workloads', nargs='+', choices=ALL_WORKLOADS,
+                        default=ALL_WORKLOADS)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    report = run(args.targets, args.workloads, args.size, args.repeat, args.seed)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    _print_table(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares the access policies of the SC HashMap on the skewed
+#              (Zipf) workload: the average number of chain nodes compared by
+#              each lookup, and the throughput. The hot keys of the workload
+#              are shuffled over the key set, since the low numbered keys
+#              it favours otherwise sit in short chains by construction.
+#
+#              python -m bench.chains --size 5000
+
+import argparse
+import gc
+import random
+import time
+
+from a6_include import hash_function_1, hash_function_2
+from bench.runner import _load, _replay
+from bench.workloads import Workload, skewed
+from hash_map_sc import HashMap
+
+POLICIES = (None, 'move_to_front', 'transpose')
+
+
+def _mean(histogram: dict) -> float:
+    """Return the mean length of a probe length histogram."""
+    count = sum(histogram.values())
+    return sum(length * times for length, times in histogram.items()) / count if count else 0.0
+
+
+def _shuffled(workload: Workload, rnd: random.Random) -> Workload:
+    """Return the workload with its keys renamed by a random permutation."""
+    keys = [key for key, _ in workload.preload]
+    rename = dict(zip(keys, rnd.sample(keys, len(keys))))
+    return Workload(workload.name,
+                    [(rename[key], value) for key, value in workload.preload],
+                    [(op, rename[key], value) for op, key, value in workload.ops])
+
+
+def compare(size: int, repeat: int, seed: int) -> list:
+    """
+    Return a row per hash function and access policy with the mean number
+    of nodes compared by the lookups that found their key, and the
+    throughput (best of repeat runs, without instrumentation).
+    """
+    rnd = random.Random(seed)
+    workload = _shuffled(skewed(size, rnd), rnd)
+    rows = []
+    for function in (hash_function_1, hash_function_2):
+        for policy in POLICIES:
+            def factory():
+                return HashMap(11, function, access_policy=policy)
+
+            hash_map = _load(factory, workload)
+            hash_map.enable_stats()
+            _replay(hash_map, workload.ops)
+            compared = _mean(hash_map.stats()['probe_hits'])
+
+            best = None
+            for _ in range(repeat):
+                hash_map = _load(factory, workload)
+                gc.collect()
+                start = time.perf_counter()
+                _replay(hash_map, workload.ops)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            rows.append({
+                'function': function.__name__,
+                'policy': policy or 'none',
+                'compared': compared,
+                'ops_per_sec': len(workload.ops) / best,
+            })
+    return rows
+
+
+def main() -> None:
+    """Parse the command line, run the comparison and print it."""
+    parser = argparse.ArgumentParser(
+        prog='python -m bench.chains',
+        description='Compare the SC HashMap access policies on the skewed workload.')
+    parser.add_argument('--size', type=int, default=5000,
+                        help='number of keys (and operations)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per policy; the best is kept')
+    parser.add_argument('--seed', type=int, default=261)
+    args = parser.parse_args()
+
+    print(f"{'function':<16} {'policy':<14} {'compared':>9} {'ops/sec':>12}")
+    for row in compare(args.size, args.repeat, args.seed):
+        print(f"{row['function']:<16} {row['policy']:<14} {row['compared']:>9.2f} "
+              f"{row['ops_per_sec']:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
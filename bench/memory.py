@@ -0,0 +1,96 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Memory report: the bytes per key each map holds once loaded
+#              with n distinct keys, traced with tracemalloc. The key strings
+#              are made beforehand and every value is the same object, so
+#              only the memory of the map itself is counted.
+#
+#              python -m bench.memory --sizes 1000 1000000 10000000
+
+import argparse
+import gc
+import tracemalloc
+
+import hash_map_cuckoo
+import hash_map_hopscotch
+import hash_map_oa
+import hash_map_robin_hood
+import hash_map_sc
+import hash_map_swiss
+from bench.targets import DictMap
+from hash_functions import builtin_hash
+
+# Maps under measurement, by name. They all use the well-mixed built-in
+# hash, so the sample hash functions do not make the large sizes quadratic.
+MAPS = {
+    'sc': lambda: hash_map_sc.HashMap(11, builtin_hash),
+    'sc_slotted': lambda: hash_map_sc.HashMap(11, builtin_hash, slotted=True),
+    'sc_compact': lambda: hash_map_sc.CompactHashMap(11, builtin_hash),
+    'oa': lambda: hash_map_oa.HashMap(11, builtin_hash),
+    'oa_slotted': lambda: hash_map_oa.HashMap(11, builtin_hash, slotted=True),
+    'oa_soa': lambda: hash_map_oa.SoAHashMap(11, builtin_hash),
+    'robin_hood': lambda: hash_map_robin_hood.HashMap(11, builtin_hash),
+    'cuckoo': lambda: hash_map_cuckoo.HashMap(11, builtin_hash),
+    'swiss': lambda: hash_map_swiss.HashMap(11, builtin_hash),
+    'hopscotch': lambda: hash_map_hopscotch.HashMap(11, builtin_hash),
+    'dict': DictMap,
+}
+
+
+def measure(factory, keys: list) -> (int, int):
+    """
+    Return the bytes held by a map from the factory once every key is put
+    in it, and the peak bytes traced while putting them.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        hash_map = factory()
+        put = hash_map.put
+        for key in keys:
+            put(key, True)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, peak
+
+
+def report(names: list, sizes: list) -> list:
+    """
+    Return a row per map and size with the bytes per key held by the map,
+    and the peak bytes per key while it was loaded (resizes included).
+    """
+    rows = []
+    for size in sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        for name in names:
+            current, peak = measure(MAPS[name], keys)
+            rows.append({
+                'map': name,
+                'size': size,
+                'bytes_per_key': current / size,
+                'peak_bytes_per_key': peak / size,
+            })
+    return rows
+
+
+def main() -> None:
+    """Parse the command line, measure the maps and print the report."""
+    parser = argparse.ArgumentParser(
+        prog='python -m bench.memory',
+        description='Report the memory per key of each map.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 1000000, 10000000],
+                        help='numbers of keys to load the maps with')
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS), default=list(MAPS))
+    args = parser.parse_args()
+
+    print(f"{'map':<12} {'keys':>10} {'bytes/key':>10} {'peak/key':>10}")
+    for row in report(args.maps, args.sizes):
+        print(f"{row['map']:<12} {row['size']:>10,} {row['bytes_per_key']:>10.1f} "
+              f"{row['peak_bytes_per_key']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
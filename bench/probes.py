@@ -0,0 +1,157 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Per-probe cost of the map hot loops, with the tables read
+#              through their raw buffers (as the maps do) and through the
+#              checked [] access of DynamicArray: the time per slot probed by
+#              the OA get() and contains_key(), per slot visited by the OA
+#              iterator, and per SC get(), for each hash function.
+#
+#              python -m bench.probes --size 5000
+
+import argparse
+import gc
+import time
+from contextlib import contextmanager
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_1, hash_function_2, raw_buffer
+from hash_functions import builtin_hash
+
+
+def _checked(da):
+    """Stand-in for raw_buffer() that leaves every access checked."""
+    return da
+
+
+@contextmanager
+def _checked_access():
+    """
+    Make the maps read their tables through the checked [] access of
+    DynamicArray rather than the raw buffers, until the block exits, even
+    on an exception (the maps look raw_buffer() up as a module global on
+    each operation). Only the lookups and the OA iterator can run in the
+    block: the other loops, such as rehashing, iterate over the buffers,
+    which DynamicArray does not allow.
+    """
+    for module in (hash_map_oa, hash_map_sc):
+        module.raw_buffer = _checked
+    try:
+        yield
+    finally:
+        for module in (hash_map_oa, hash_map_sc):
+            module.raw_buffer = raw_buffer
+
+
+def _best(run, repeat: int) -> float:
+    """Return the shortest time of repeat calls of run()."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _probes(histogram: dict) -> int:
+    """Return the total number of slots probed of a probe length histogram."""
+    return sum(length * count for length, count in histogram.items())
+
+
+def _cases(function, size: int) -> list:
+    """
+    Return the (name, steps, run) cases for the hash function: run() does
+    the operations timed, and steps is the number of probe steps (slots,
+    or operations for SC) they take.
+    """
+    keys = ['key' + str(i) for i in range(size)]
+    misses = ['miss' + str(i) for i in range(size)]
+
+    oa = hash_map_oa.HashMap(11, function)
+    sc = hash_map_sc.HashMap(11, function)
+    for key in keys:
+        oa.put(key, True)
+        sc.put(key, True)
+
+    # Count the slots each lookup probes.
+    oa.enable_stats()
+    for key in keys:
+        oa.get(key)
+    for key in misses:
+        oa.contains_key(key)
+    counters = oa.stats()
+    oa.disable_stats()
+
+    def oa_hits():
+        get = oa.get
+        for key in keys:
+            get(key)
+
+    def oa_misses():
+        contains_key = oa.contains_key
+        for key in misses:
+            contains_key(key)
+
+    def oa_iterate():
+        for _ in oa:
+            pass
+
+    def sc_hits():
+        get = sc.get
+        for key in keys:
+            get(key)
+
+    return [
+        ('oa get() hit', _probes(counters['probe_hits']), oa_hits),
+        ('oa contains_key() miss', _probes(counters['probe_misses']), oa_misses),
+        ('oa iterator', oa.get_capacity(), oa_iterate),
+        ('sc get() hit', size, sc_hits),
+    ]
+
+
+def compare(size: int, repeat: int) -> list:
+    """
+    Return a row per hash function and case with the time per probe step
+    through the checked access and through the raw buffers.
+    """
+    rows = []
+    # With the built-in hash, SC chains are short and the bucket read is a
+    # larger part of each get().
+    for function in (hash_function_1, hash_function_2, builtin_hash):
+        for name, steps, run in _cases(function, size):
+            with _checked_access():
+                checked = _best(run, repeat)
+            raw = _best(run, repeat)
+            rows.append({
+                'function': function.__name__,
+                'case': name,
+                'steps': steps,
+                'checked_ns': checked * 1e9 / steps,
+                'raw_ns': raw * 1e9 / steps,
+            })
+    return rows
+
+
+def main() -> None:
+    """Parse the command line, run the comparison and print it."""
+    parser = argparse.ArgumentParser(
+        prog='python -m bench.probes',
+        description='Compare the per-probe cost of checked and raw table access.')
+    parser.add_argument('--size', type=int, default=5000,
+                        help='number of keys in the maps')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timed runs per case; the best is kept')
+    args = parser.parse_args()
+
+    print(f"{'function':<16} {'case':<24} {'steps':>9} {'checked ns':>11} "
+          f"{'raw ns':>8} {'speedup':>8}")
+    for row in compare(args.size, args.repeat):
+        print(f"{row['function']:<16} {row['case']:<24} {row['steps']:>9,} "
+              f"{row['checked_ns']:>11.1f} {row['raw_ns']:>8.1f} "
+              f"{row['checked_ns'] / row['raw_ns']:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Runs the benchmark workloads against the targets, measuring
+#              throughput, per-operation latency percentiles and peak memory,
+#              and collects the results as JSON-ready dictionaries.
+
+import gc
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from bench.targets import TARGETS, FIND_MODE
+from bench.workloads import WORKLOADS, PUT, GET, CONTAINS, find_mode_input
+
+
+def _load(factory, workload):
+    """Return a new map from the factory with the workload preloaded."""
+    hash_map = factory()
+    for key, value in workload.preload:
+        hash_map.put(key, value)
+    return hash_map
+
+
+def _replay(hash_map, ops) -> None:
+    """Run every operation of the workload against the map."""
+    put, get = hash_map.put, hash_map.get
+    contains, remove = hash_map.contains_key, hash_map.remove
+    for op, key, value in ops:
+        if op == GET:
+            get(key)
+        elif op == PUT:
+            put(key, value)
+        elif op == CONTAINS:
+            contains(key)
+        else:
+            remove(key)
+
+
+def _replay_timed(hash_map, ops) -> list:
+    """Run every operation of the workload, returning each latency in ns."""
+    put, get = hash_map.put, hash_map.get
+    contains, remove = hash_map.contains_key, hash_map.remove
+    clock = time.perf_counter_ns
+    latencies = []
+    for op, key, value in ops:
+        start = clock()
+        if op == GET:
+            get(key)
+        elif op == PUT:
+            put(key, value)
+        elif op == CONTAINS:
+            contains(key)
+        else:
+            remove(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def percentiles(samples: list) -> dict:
+    """Return the p50, p90, p99 and max of the samples."""
+    samples = sorted(samples)
+    last = len(samples) - 1
+    return {
+        'p50': samples[min(last, len(samples) * 50 // 100)],
+        'p90': samples[min(last, len(samples) * 90 // 100)],
+        'p99': samples[min(last, len(samples) * 99 // 100)],
+        'max': samples[last],
+    }
+
+
+def _peak_bytes(run) -> int:
+    """Return the peak memory traced while calling run()."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_workload(target: str, workload, repeat: int) -> dict:
+    """
+    Benchmark one operation workload on one target. Throughput is the best
+    of repeat untimed-per-op runs; latency and memory get a run each.
+    """
+    factory = TARGETS[target]
+    best = None
+    for _ in range(repeat):
+        hash_map = _load(factory, workload)
+        gc.collect()
+        start = time.perf_counter()
+        _replay(hash_map, workload.ops)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    latencies = _replay_timed(_load(factory, workload), workload.ops)
+    peak = _peak_bytes(lambda: _replay(_load(factory, workload), workload.ops))
+
+    return {
+        'target': target,
+        'workload': workload.name,
+        'ops': len(workload.ops),
+        'ops_per_sec': len(workload.ops) / best if best else None,
+        'latency_ns': percentiles(latencies),
+        'peak_bytes': peak,
+    }
+
+
+def bench_find_mode(target: str, da, repeat: int) -> dict:
+    """
+    Benchmark find_mode() of one target. Each call counts as one operation,
+    and the latency percentiles are taken over the repeated calls.
+    """
+    find_mode = FIND_MODE[target]
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter_ns()
+        find_mode(da)
+        timings.append(time.perf_counter_ns() - start)
+
+    return {
+        'target': target,
+        'workload': 'find_mode',
+        'ops': 1,
+        'ops_per_sec': 1e9 / min(timings),
+        'latency_ns': percentiles(timings),
+        'peak_bytes': _peak_bytes(lambda: find_mode(da)),
+    }
+
+
+def run(targets: list, workloads: list, size: int, repeat: int, seed: int) -> dict:
+    """
+    Run the given workloads (by name, including 'find_mode') against the
+    given targets, and return the results with the run metadata.
+    """
+    results = []
+    for name in workloads:
+        if name == 'find_mode':
+            da = find_mode_input(size, random.Random(seed))
+            for target in targets:
+                if target in FIND_MODE:
+                    results.append(bench_find_mode(target, da, repeat))
+            continue
+
+        workload = WORKLOADS[name](size, random.Random(seed))
+        for target in targets:
+            results.append(bench_workload(target, workload, repeat))
+
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'size': size,
+            'repeat': repeat,
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
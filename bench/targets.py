@@ -0,0 +1,79 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Maps under benchmark. Each target is a factory returning an
+#              empty map with the HashMap API (put, get, contains_key,
+#              remove, get_size).
+
+from collections import Counter
+
+import hash_map_cuckoo
+import hash_map_hopscotch
+import hash_map_oa
+import hash_map_robin_hood
+import hash_map_sc
+import hash_map_swiss
+from a6_include import hash_function_1, hash_function_2
+
+
+class DictMap:
+    """
+    Baseline wrapping the built-in dict behind the HashMap API.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty map."""
+        self._data = {}
+
+    def put(self, key: str, value: object) -> None:
+        """Insert or update the key/value pair."""
+        self._data[key] = value
+
+    def get(self, key: str) -> object:
+        """Return the value of the key, or None."""
+        return self._data.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """Return True if the key is in the map."""
+        return key in self._data
+
+    def remove(self, key: str) -> None:
+        """Remove the key, if present."""
+        self._data.pop(key, None)
+
+    def get_size(self) -> int:
+        """Return the number of keys."""
+        return len(self._data)
+
+
+def dict_find_mode(da) -> (list, int):
+    """Baseline for hash_map_sc.find_mode() using collections.Counter."""
+    counts = Counter(str(da[i]) for i in range(da.length()))
+    frequency = max(counts.values())
+    return [key for key, count in counts.items() if count == frequency], frequency
+
+
+# Factories for every map under benchmark, by target name.
+TARGETS = {
+    'sc/hash_function_1': lambda: hash_map_sc.HashMap(11, hash_function_1),
+    'sc/hash_function_2': lambda: hash_map_sc.HashMap(11, hash_function_2),
+    'sc_compact/hash_function_1': lambda: hash_map_sc.CompactHashMap(11, hash_function_1),
+    'sc_compact/hash_function_2': lambda: hash_map_sc.CompactHashMap(11, hash_function_2),
+    'oa/hash_function_1': lambda: hash_map_oa.HashMap(11, hash_function_1),
+    'oa/hash_function_2': lambda: hash_map_oa.HashMap(11, hash_function_2),
+    'robin_hood/hash_function_1': lambda: hash_map_robin_hood.HashMap(11, hash_function_1),
+    'robin_hood/hash_function_2': lambda: hash_map_robin_hood.HashMap(11, hash_function_2),
+    'cuckoo/hash_function_1': lambda: hash_map_cuckoo.HashMap(11, hash_function_1),
+    'cuckoo/hash_function_2': lambda: hash_map_cuckoo.HashMap(11, hash_function_2),
+    'swiss/hash_function_1': lambda: hash_map_swiss.HashMap(11, hash_function_1),
+    'swiss/hash_function_2': lambda: hash_map_swiss.HashMap(11, hash_function_2),
+    'hopscotch/hash_function_1': lambda: hash_map_hopscotch.HashMap(11, hash_function_1),
+    'hopscotch/hash_function_2': lambda: hash_map_hopscotch.HashMap(11, hash_function_2),
+    'dict': DictMap,
+}
+
+# find_mode() implementations, by target name. Targets without one are
+# skipped by the find_mode workload.
+FIND_MODE = {
+    'sc/hash_function_1': hash_map_sc.find_mode,
+    'dict': dict_find_mode,
+}
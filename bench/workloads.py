@@ -0,0 +1,107 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Benchmark workloads. Each workload is generated up front from
+#              a seed, as the key/value pairs to preload into the map and the
+#              list of operations to time, so every target replays exactly
+#              the same sequence.
+
+import random
+
+from a6_include import DynamicArray
+
+# Operation codes.
+PUT, GET, CONTAINS, REMOVE = 'put', 'get', 'contains', 'remove'
+
+
+class Workload:
+    """
+    A named sequence of map operations, with the pairs to load beforehand.
+    """
+
+    def __init__(self, name: str, preload: list, ops: list) -> None:
+        """
+        Initialize the workload. ops is a list of (op, key, value) tuples,
+        where value is None for every op but PUT.
+        """
+        self.name = name
+        self.preload = preload
+        self.ops = ops
+
+
+def _key(i: int) -> str:
+    """Return the i-th benchmark key."""
+    return 'key' + str(i)
+
+
+def _zipf_ranks(rnd: random.Random, n: int, count: int, s: float = 1.1) -> list:
+    """Return count ranks in [0, n), drawn with Zipf exponent s."""
+    weights = [1 / (rank + 1) ** s for rank in range(n)]
+    return rnd.choices(range(n), weights=weights, k=count)
+
+
+def insert_only(n: int, rnd: random.Random) -> Workload:
+    """n inserts of distinct keys into an empty map."""
+    return Workload('insert_only', [], [(PUT, _key(i), i) for i in range(n)])
+
+
+def read_heavy(n: int, rnd: random.Random) -> Workload:
+    """n operations on n keys: 90% hits with get(), 10% updates."""
+    ops = []
+    for _ in range(n):
+        i = rnd.randrange(n)
+        if rnd.random() < 0.9:
+            ops.append((GET, _key(i), None))
+        else:
+            ops.append((PUT, _key(i), -i))
+    return Workload('read_heavy', [(_key(i), i) for i in range(n)], ops)
+
+
+def miss_heavy(n: int, rnd: random.Random) -> Workload:
+    """n lookups on n keys, 90% of them for keys that are not present."""
+    ops = []
+    for _ in range(n):
+        i = rnd.randrange(n)
+        if rnd.random() < 0.9:
+            ops.append((CONTAINS, 'miss' + str(i), None))
+        else:
+            ops.append((CONTAINS, _key(i), None))
+    return Workload('miss_heavy', [(_key(i), i) for i in range(n)], ops)
+
+
+def churn(n: int, rnd: random.Random) -> Workload:
+    """
+    n operations on a sliding window of n keys: each step removes the
+    oldest key and inserts a new one, with a lookup in between.
+    """
+    ops = []
+    for i in range(n // 3):
+        ops.append((REMOVE, _key(i), None))
+        ops.append((PUT, _key(n + i), i))
+        ops.append((GET, _key(rnd.randrange(i + 1, n + i + 1)), None))
+    return Workload('churn', [(_key(i), i) for i in range(n)], ops)
+
+
+def skewed(n: int, rnd: random.Random) -> Workload:
+    """n operations on n keys, Zipf distributed: 95% get, 5% put."""
+    ops = []
+    for i in _zipf_ranks(rnd, n, n):
+        if rnd.random() < 0.95:
+            ops.append((GET, _key(i), None))
+        else:
+            ops.append((PUT, _key(i), -i))
+    return Workload('skewed', [(_key(i), i) for i in range(n)], ops)
+
+
+def find_mode_input(n: int, rnd: random.Random) -> DynamicArray:
+    """Input array of n Zipf distributed strings for find_mode()."""
+    return DynamicArray(['word' + str(i) for i in _zipf_ranks(rnd, n // 4 + 1, n)])
+
+
+# Operation workloads, by name. find_mode is handled on its own.
+WORKLOADS = {
+    'insert_only': insert_only,
+    'read_heavy': read_heavy,
+    'miss_heavy': miss_heavy,
+    'churn': churn,
+    'skewed': skewed,
+}
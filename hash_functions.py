@@ -0,0 +1,280 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Registry of hash functions for the HashMaps (SC & OA), next to
+#              the two course functions of a6_include: 64-bit FNV-1a, seeded
+#              SipHash-2-4, and the built-in hash() with a finalizer mix.
+#              FNV-1a and SipHash are per-byte pure-Python reference
+#              implementations, kept to compare hash quality; they are
+#              several times (SipHash tens of times) slower than the
+#              course functions, so only builtin_hash() is meant for real
+#              use. Run this file for a quality and speed report of each.
+
+import itertools
+import os
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:     # fmix64_batch() falls back to the scalar finalizer
+    np = None
+
+from a6_include import hash_function_1, hash_function_2, batch_hash
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# FNV-1a 64-bit parameters.
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def fnv1a(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the UTF-8 bytes of the key. Reference only: the
+    per-byte loop makes it several times slower than the course functions.
+    """
+    hash = _FNV_OFFSET
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK64
+    return hash
+
+
+def _rotl(x: int, bits: int) -> int:
+    """Rotate the 64-bit integer x left by the given number of bits."""
+    return ((x << bits) | (x >> (64 - bits))) & _MASK64
+
+
+def _sip_rounds(v0: int, v1: int, v2: int, v3: int, rounds: int) -> tuple:
+    """Apply the given number of SipRounds to the SipHash state."""
+    for _ in range(rounds):
+        v0 = (v0 + v1) & _MASK64
+        v1 = _rotl(v1, 13) ^ v0
+        v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & _MASK64
+        v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & _MASK64
+        v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & _MASK64
+        v1 = _rotl(v1, 17) ^ v2
+        v2 = _rotl(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """
+    SipHash-2-4 of the bytes under the 128-bit key (k0, k1), given as two
+    64-bit little-endian halves. Reference only: in pure Python it is tens
+    of times slower than the course functions.
+    """
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    # Compress the whole 8-byte words, then the tail with the length byte.
+    length = len(data)
+    end = length - length % 8
+    for offset in range(0, end, 8):
+        m = int.from_bytes(data[offset:offset + 8], 'little')
+        v3 ^= m
+        v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3, 2)
+        v0 ^= m
+    m = ((length & 0xFF) << 56) | int.from_bytes(data[end:], 'little')
+    v3 ^= m
+    v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3, 2)
+    v0 ^= m
+
+    # Finalize.
+    v2 ^= 0xFF
+    v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3, 4)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def make_siphash(seed: int = None):
+    """
+    Returns a hash function computing SipHash-2-4 of the UTF-8 bytes of the
+    key, keyed by the given 128-bit seed, or by a random seed if None.
+    """
+    if seed is None:
+        seed = int.from_bytes(os.urandom(16), 'little')
+    k0, k1 = seed & _MASK64, (seed >> 64) & _MASK64
+
+    def siphash(key: str) -> int:
+        """SipHash-2-4 of the key under the seed of make_siphash()."""
+        return siphash24(k0, k1, key.encode('utf-8'))
+
+    return siphash
+
+
+def fmix64(hash: int) -> int:
+    """MurmurHash3 64-bit finalizer: spreads every input bit over the output."""
+    hash ^= hash >> 33
+    hash = (hash * 0xFF51AFD7ED558CCD) & _MASK64
+    hash ^= hash >> 33
+    hash = (hash * 0xC4CEB9FE1A85EC53) & _MASK64
+    hash ^= hash >> 33
+    return hash
+
+
+def fmix64_batch(hashes: list) -> list:
+    """
+    Batch version of fmix64() over the low 64 bits of each of the hashes,
+    computed in one vectorized pass when NumPy is available (uint64
+    arithmetic wraps around exactly like the scalar mask).
+    """
+    if np is None:
+        return [fmix64(hash & _MASK64) for hash in hashes]
+    mixed = np.fromiter((hash & _MASK64 for hash in hashes),
+                        dtype=np.uint64, count=len(hashes))
+    shift = np.uint64(33)
+    mixed ^= mixed >> shift
+    mixed *= np.uint64(0xFF51AFD7ED558CCD)
+    mixed ^= mixed >> shift
+    mixed *= np.uint64(0xC4CEB9FE1A85EC53)
+    mixed ^= mixed >> shift
+    return mixed.tolist()
+
+
+def builtin_hash(key: str) -> int:
+    """
+    The built-in hash() of the key (seeded per process for strings, see
+    PYTHONHASHSEED), run through a finalizer mix and made non-negative.
+    """
+    return fmix64(hash(key) & _MASK64)
+
+
+def finalized(function):
+    """
+    Returns a hash function that runs the low 64 bits of the given one
+    through fmix64(), so that every bit of the result, and in particular
+    the low bits used to index a power-of-two table, depends on all of them.
+    Its batch version, found by batch_hash(), finalizes the batch version of
+    the given function.
+    """
+    def mixed(key: str) -> int:
+        """The finalized hash of the key."""
+        return fmix64(function(key) & _MASK64)
+
+    def mixed_batch(keys: list) -> list:
+        """The finalized hashes of the keys."""
+        return fmix64_batch(batch_hash(function, keys))
+
+    mixed.batch = mixed_batch
+    return mixed
+
+
+# Hash functions by name. 'fnv1a' and 'siphash' are the slow reference
+# implementations above. The maps do not consult the registry (every map
+# takes its function explicitly); DEFAULT_HASH_FUNCTION is only what
+# get_hash_function() returns without a name, the fastest well-mixed one.
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a,
+    'siphash': make_siphash(),
+    'builtin': builtin_hash,
+}
+DEFAULT_HASH_FUNCTION = 'builtin'
+
+
+def register_hash_function(name: str, function) -> None:
+    """
+    Adds the hash function to the registry under the given name, replacing
+    any function of that name.
+    """
+    HASH_FUNCTIONS[name] = function
+
+
+def get_hash_function(name: str = DEFAULT_HASH_FUNCTION):
+    """
+    Returns the hash function registered under the given name (by default,
+    the default one). Raises KeyError if there is no such function.
+    """
+    return HASH_FUNCTIONS[name]
+
+
+# ------------------- QUALITY AND SPEED REPORT ----------------------------- #
+
+def _speed(function, keys: list) -> float:
+    """Returns the time in ns to hash one of the keys, best of 3 runs."""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        for key in keys:
+            function(key)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(keys)
+
+
+def _spread(function, keys: list, capacity: int) -> dict:
+    """
+    Bucket statistics of the keys in a table of the given capacity: the
+    longest chain, the fraction of empty buckets, and the chi-square
+    statistic divided by its degrees of freedom (about 1 for a uniform hash).
+    """
+    counts = [0] * capacity
+    for key in keys:
+        counts[function(key) % capacity] += 1
+    mean = len(keys) / capacity
+    chi_square = sum((count - mean) ** 2 for count in counts) / mean
+    return {
+        'longest_chain': max(counts),
+        'empty_fraction': counts.count(0) / capacity,
+        'chi_square': chi_square / (capacity - 1),
+    }
+
+
+def _anagram_distinct(function) -> float:
+    """Returns the fraction of distinct hashes over the anagrams of a word."""
+    keys = [''.join(p) for p in itertools.permutations('abcdefg')]
+    return len({function(key) for key in keys}) / len(keys)
+
+
+def _avalanche(function, rnd: random.Random, samples: int = 2000) -> float:
+    """
+    Returns the mean fraction of the low 32 bits of the hash that change
+    when one bit of one character of a key is flipped (0.5 is ideal).
+    """
+    changed = 0
+    for _ in range(samples):
+        key = ''.join(chr(rnd.randrange(33, 127)) for _ in range(8))
+        i, bit = rnd.randrange(len(key)), 1 << rnd.randrange(6)
+        flipped = key[:i] + chr(ord(key[i]) ^ bit) + key[i + 1:]
+        diff = (function(key) ^ function(flipped)) & 0xFFFFFFFF
+        changed += bin(diff).count('1')
+    return changed / (samples * 32)
+
+
+def report(n: int = 20000, seed: int = 261) -> list:
+    """
+    Returns the quality and speed report of each registered hash function
+    as a list of dictionaries, over n sequential keys 'str' + str(i) in
+    tables with a prime (and a power of two) capacity at load factor ~1.
+    """
+    keys = ['str' + str(i) for i in range(n)]
+    rows = []
+    for name, function in HASH_FUNCTIONS.items():
+        row = {'name': name, 'ns_per_key': _speed(function, keys)}
+        for label, capacity in (('prime', 20011), ('pow2', 16384)):
+            for stat, value in _spread(function, keys, capacity).items():
+                row[label + '_' + stat] = value
+        row['anagram_distinct'] = _anagram_distinct(function)
+        row['avalanche'] = _avalanche(function, random.Random(seed))
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+
+    print(f"{'function':<16} {'ns/key':>7} {'longest':>8} {'empty':>6} {'chi2':>8} "
+          f"{'longest':>8} {'empty':>6} {'chi2':>8} {'anagrams':>9} {'aval.':>6}")
+    print(f"{'':<16} {'':>7} {'--- prime capacity (20011) ---':>24} "
+          f"{'--- pow2 capacity (16384) ---':>24}")
+    for row in report():
+        print(f"{row['name']:<16} {row['ns_per_key']:>7.0f} "
+              f"{row['prime_longest_chain']:>8} {row['prime_empty_fraction']:>6.2f} "
+              f"{row['prime_chi_square']:>8.2f} "
+              f"{row['pow2_longest_chain']:>8} {row['pow2_empty_fraction']:>6.2f} "
+              f"{row['pow2_chi_square']:>8.2f} "
+              f"{row['anagram_distinct']:>9.3f} {row['avalanche']:>6.3f}")
@@ -0,0 +1,585 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Implements a hashmap using bucketized cuckoo hashing. Every key
+#              may only live in one of the 4 slots of each of its two buckets,
+#              or in a small stash of keys that could not be placed, so a
+#              lookup examines at most 2 * 4 + 4 = 12 slots. Inserts make
+#              room by kicking residents over to their other bucket. Keys
+#              whose whole hash is shared by too many others go to overflow
+#              chains instead, which lookups also walk, so the bound only
+#              holds under a well-mixed hash function.
+
+import random
+
+from a6_include import (DynamicArray, HashEntry, LinkedList,
+                        hash_function_1, hash_function_2, raw_buffer)
+from hash_functions import builtin_hash, finalized, fmix64
+from primes import next_prime
+
+# Slots per bucket, and stash slots before the table is rebuilt.
+_BUCKET_SIZE = 4
+_STASH_SIZE = 4
+
+# Evictions tried by an insert before its homeless entry goes to the stash.
+_MAX_KICKS = 100
+
+# Below this load factor, an overflowing stash is fixed by placing the
+# entries again with a fresh seed rather than by growing the table, for up
+# to _MAX_RESEEDS seeds in a row.
+_MIN_GROW_LOAD = 0.5
+_MAX_RESEEDS = 4
+
+
+class HashMap:
+    """
+    Cuckoo hashing HashMap with the same public API as the quadratic
+    probing HashMap of hash_map_oa. The capacity is the number of slots:
+    a prime number of buckets of 4 slots each, held in one DynamicArray
+    of HashEntry objects (or None), next to a DynamicArray stash.
+
+    Both buckets of a key are derived from a single call of the given
+    hash function, finalized and then mixed again with the seed of the
+    table (see _buckets_of()). Lookups never probe further than these two
+    buckets and the stash, which never holds more than 4 entries. The
+    only entries outside them are those of keys sharing their whole hash
+    with enough others to crowd their two buckets, which no table size or
+    seed can separate: like in hash_map_hopscotch, they are kept in a
+    LinkedList for their first bucket, and a lookup of any key of that
+    bucket also walks that chain.
+
+    The lookup bound of 12 slots therefore only holds while the chains are
+    empty, as they stay under a well-mixed hash such as builtin_hash. The
+    course hash functions give many keys the same hash: of 20000 keys
+    'str0'..'str19999', hash_function_1 sends 19400 to chains of up to 1144
+    nodes, and hash_function_2 sends 16834. Chained entries hold no slot,
+    so table_load() can then exceed 1.
+    """
+
+    def __init__(self, capacity: int, function, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution
+
+        max_load must be between 0 and 1 (exclusive): the kicks need free
+        slots, and a load factor of 0 can not be reached by growing.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError('max_load must be between 0 and 1, not ' + repr(max_load))
+
+        # Picks the entries to evict and the seeds; seeded so the layout
+        # is reproducible.
+        self._random = random.Random(capacity)
+        self._seed = 0
+
+        # the number of buckets must be a prime number
+        self._allocate(next_prime(-(-capacity // _BUCKET_SIZE)))
+        self._stash = DynamicArray()
+
+        self._hash_function = finalized(function)
+        self._max_load = max_load
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap,
+        followed by the stash.
+        """
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': ' + str(self._slots[i]) + '\n'
+        for i in range(self._stash.length()):
+            out += 'stash: ' + str(self._stash[i]) + '\n'
+        for bucket in range(self._buckets):
+            if self._overflow[bucket] is not None:
+                out += 'overflow ' + str(bucket) + ': ' + str(self._overflow[bucket]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+    def _allocate(self, buckets: int) -> None:
+        """
+        Helper function that allocates an empty table and empty overflow
+        chains of the given number of buckets.
+        """
+        self._buckets = buckets
+        self._capacity = buckets * _BUCKET_SIZE
+        self._slots = DynamicArray([None] * self._capacity)
+        self._overflow = [None] * buckets
+        self._overflow_size = 0
+
+    def _buckets_of(self, hash: int) -> tuple:
+        """
+        Helper function that returns the two (distinct) buckets of a key
+        given its (finalized) hash, mixed with the seed of the table: the
+        low and high halves of the mix each pick one.
+        """
+        mixed = fmix64(hash ^ self._seed)
+        n = self._buckets
+        first = mixed % n
+        return first, (first + 1 + (mixed >> 32) % (n - 1)) % n
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Helper function that returns the index of the table slot holding
+        the key given its hash, or -1 if it is not in the table (it may
+        still be in the stash or in an overflow chain).
+        """
+        slots = raw_buffer(self._slots)
+        for bucket in self._buckets_of(hash):
+            start = bucket * _BUCKET_SIZE
+            for i in range(start, start + _BUCKET_SIZE):
+                entry = slots[i]
+                if entry is not None and entry.hash == hash and entry.key == key:
+                    return i
+        return -1
+
+    def _find_stash(self, key: str, hash: int) -> int:
+        """
+        Helper function that returns the index of the key in the stash
+        given its hash, or -1 if it is not in the stash.
+        """
+        stash = self._stash
+        for i in range(stash.length()):
+            entry = stash[i]
+            if entry.hash == hash and entry.key == key:
+                return i
+        return -1
+
+    def _find_overflow(self, key: str, hash: int):
+        """
+        Helper function that returns the node of the key in the overflow
+        chain of its first bucket, or None if it is not there.
+        """
+        chain = self._overflow[self._buckets_of(hash)[0]]
+        if chain is None:
+            return None
+        return chain.contains(key, hash)
+
+    def _place(self, entry: HashEntry) -> HashEntry:
+        """
+        Helper function that places an entry whose key is not in the table.
+        If both its buckets are full, it evicts a random resident of one of
+        them, then places the evicted entry in its other bucket the same way,
+        for up to _MAX_KICKS evictions. Returns None once an entry found a
+        free slot, otherwise the entry left without one. The entry is
+        returned right away if its buckets are crowded (see _crowded()).
+        """
+        slots = raw_buffer(self._slots)
+        rnd = self._random
+        came_from = -1
+        for _ in range(_MAX_KICKS):
+            first, second = self._buckets_of(entry.hash)
+            for bucket in (first, second):
+                start = bucket * _BUCKET_SIZE
+                for i in range(start, start + _BUCKET_SIZE):
+                    if slots[i] is None:
+                        slots[i] = entry
+                        return None
+            if came_from == -1 and self._crowded(entry.hash):
+                return entry
+
+            # Evict from the bucket the entry was not just evicted from.
+            if first == came_from:
+                bucket = second
+            elif second == came_from:
+                bucket = first
+            else:
+                bucket = first if rnd.random() < 0.5 else second
+            i = bucket * _BUCKET_SIZE + rnd.randrange(_BUCKET_SIZE)
+            slots[i], entry = entry, slots[i]
+            came_from = bucket
+        return entry
+
+    def _crowded(self, hash: int) -> bool:
+        """
+        Helper function that returns True if both buckets of the hash are
+        full, and at least half their slots hold entries sharing that hash.
+        Evictions rarely make room there, as the other residents are most
+        likely crowded out of their other bucket the same way.
+        """
+        slots = raw_buffer(self._slots)
+        shared = 0
+        for bucket in self._buckets_of(hash):
+            start = bucket * _BUCKET_SIZE
+            for i in range(start, start + _BUCKET_SIZE):
+                if slots[i] is None:
+                    return False
+                if slots[i].hash == hash:
+                    shared += 1
+        return shared >= _BUCKET_SIZE
+
+    def _insert(self, entry: HashEntry) -> HashEntry:
+        """
+        Helper function that places an entry whose key is not in the hash
+        map in the table, or in the overflow chain of its first bucket if
+        its buckets are crowded (see _crowded()). Returns None, or the entry
+        left without a slot by the evictions, for the stash.
+        """
+        homeless = self._place(entry)
+        if homeless is None or not self._crowded(homeless.hash):
+            return homeless
+        first = self._buckets_of(homeless.hash)[0]
+        if self._overflow[first] is None:
+            self._overflow[first] = LinkedList()
+        self._overflow[first].insert(homeless.key, homeless.value, homeless.hash)
+        self._overflow_size += 1
+        return None
+
+    def _stash_entry(self, entry: HashEntry) -> None:
+        """
+        Helper function that puts an entry that could not be placed in the
+        stash, and rebuilds the table if that overfills it: larger if at
+        least half the slots are full, otherwise with a fresh seed.
+        """
+        self._stash.append(entry)
+        if self._stash.length() > _STASH_SIZE:
+            if self._slot_load() >= _MIN_GROW_LOAD:
+                self._rehash(next_prime(2 * self._buckets))
+            else:
+                self._rehash(self._buckets, reseed=True)
+
+    def _slot_load(self) -> float:
+        """
+        Helper function that returns the fraction of the table slots
+        holding an entry.
+        """
+        return (self._size - self._stash.length() - self._overflow_size) / self._capacity
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the given key
+        already exists in the hash map, its associated value is replaced
+        with the new value. If the given key is not in the hash map, a
+        new key/value pair is added.
+
+        The table is resized to double its current number of buckets
+        (rounded up to a prime) when adding the pair would take the slots
+        held above max_load, or when the stash overflows while at least
+        half the slots are held.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            raw_buffer(self._slots)[i].value = value
+            return
+        i = self._find_stash(key, hash)
+        if i != -1:
+            self._stash[i].value = value
+            return
+        if self._overflow_size:
+            node = self._find_overflow(key, hash)
+            if node is not None:
+                node.value = value
+                return
+
+        if (self._size - self._overflow_size + 1) / self._capacity > self._max_load:
+            self._rehash(next_prime(2 * self._buckets))
+        homeless = self._insert(HashEntry(key, value, hash))
+        self._size += 1
+        if homeless is not None:
+            self._stash_entry(homeless)
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets (slots) in the hash table.
+        Every entry not in the stash or an overflow chain holds a slot.
+        """
+        return self._capacity - self._size + self._stash.length() + self._overflow_size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. All existing
+        key/value pairs remain in the new hash map, and all hash table
+        links are rehashed.
+
+        The method does nothing if new_capacity less than the current
+        number of elements in the hash map. If new_capacity is valid, it is
+        rounded up to a whole prime number of buckets, which then keeps
+        doubling until the load factor is within max_load.
+        """
+        # Capacity must be larger than current number of elements.
+        if new_capacity < self._size:
+            return
+
+        # The number of buckets must be a prime number.
+        buckets = next_prime(-(-new_capacity // _BUCKET_SIZE))
+        while (self._size - self._overflow_size) / (buckets * _BUCKET_SIZE) > self._max_load:
+            buckets = next_prime(2 * buckets)
+
+        self._rehash(buckets)
+
+    def _rehash(self, buckets: int, reseed: bool = False) -> None:
+        """
+        Helper function that places every entry, of the table, the stash
+        and the overflow chains, into a new table of the given (prime)
+        number of buckets, using the cached hashes, with a fresh seed if
+        reseed is True. For as long as the entries left without a slot
+        overflow the stash, places them all again: with a fresh seed while
+        less than half the slots are full, up to _MAX_RESEEDS times in a
+        row, and otherwise in a table of double the number of buckets.
+        The hash map size does not change.
+        """
+        entries = self.get_entries()
+        reseeds = 0
+        while True:
+            if reseed:
+                self._seed = self._random.getrandbits(64)
+                reseeds += 1
+            self._allocate(buckets)
+            self._stash = DynamicArray()
+            homeless = DynamicArray()
+            for i in range(entries.length()):
+                entry = self._insert(entries[i])
+                if entry is not None:
+                    homeless.append(entry)
+            self._stash = homeless
+            if homeless.length() <= _STASH_SIZE:
+                return
+            reseed = self._slot_load() < _MIN_GROW_LOAD and reseeds < _MAX_RESEEDS
+            if not reseed:
+                buckets = next_prime(2 * buckets)
+
+    def get_entries(self) -> DynamicArray:
+        """
+        Returns a dynamic array of the HashEntry objects of the table,
+        followed by those of the stash, and by HashEntry copies of the
+        nodes of the overflow chains.
+        """
+        entries = DynamicArray()
+        for i in range(self._capacity):
+            if self._slots[i] is not None:
+                entries.append(self._slots[i])
+        for i in range(self._stash.length()):
+            entries.append(self._stash[i])
+        for chain in self._overflow:
+            if chain is not None:
+                for node in chain:
+                    entries.append(HashEntry(node.key, node.value, node.hash))
+        return entries
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is
+        not in the hash map, the method returns None.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            return raw_buffer(self._slots)[i].value
+        if self._stash.length():
+            i = self._find_stash(key, hash)
+            if i != -1:
+                return self._stash[i].value
+        if self._overflow_size:
+            node = self._find_overflow(key, hash)
+            if node is not None:
+                return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it
+        returns False. An empty hash map does not contain any keys.
+        """
+        if self._size == 0:
+            return False
+        hash = self._hash_function(key)
+        if self._find(key, hash) != -1:
+            return True
+        if self._stash.length() and self._find_stash(key, hash) != -1:
+            return True
+        return self._overflow_size > 0 and self._find_overflow(key, hash) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        If the key is not in the hash map, the method does nothing.
+
+        A slot freed in the table is handed to the first stashed entry
+        that has it in one of its buckets or, failing that, to the first
+        entry of the overflow chain of its bucket.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i == -1:
+            i = self._find_stash(key, hash)
+            if i != -1:
+                self._unstash(i)
+                self._size -= 1
+            elif self._overflow_size:
+                first = self._buckets_of(hash)[0]
+                chain = self._overflow[first]
+                if chain is not None and chain.remove(key, hash):
+                    self._shorten_overflow(first)
+                    self._size -= 1
+            return
+
+        self._slots[i] = None
+        self._size -= 1
+        bucket = i // _BUCKET_SIZE
+        for j in range(self._stash.length()):
+            if bucket in self._buckets_of(self._stash[j].hash):
+                self._slots[i] = self._unstash(j)
+                return
+        chain = self._overflow[bucket]
+        if chain is not None:
+            node = next(iter(chain))
+            self._slots[i] = HashEntry(node.key, node.value, node.hash)
+            chain.remove(node.key, node.hash)
+            self._shorten_overflow(bucket)
+
+    def _shorten_overflow(self, bucket: int) -> None:
+        """
+        Helper function to call once a node was removed from the overflow
+        chain of the given bucket, which is dropped if it is now empty.
+        """
+        if self._overflow[bucket].length() == 0:
+            self._overflow[bucket] = None
+        self._overflow_size -= 1
+
+    def _unstash(self, i: int) -> HashEntry:
+        """
+        Helper function that removes the entry at the given index of the
+        stash, and returns it.
+        """
+        stash = self._stash
+        stash.swap(i, stash.length() - 1)
+        return stash.pop()
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the
+        underlying hash table capacity.
+        """
+        self._allocate(self._buckets)
+        self._stash = DynamicArray()
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map. The results are unsorted.
+        """
+        da = DynamicArray()
+        entries = self.get_entries()
+        for i in range(entries.length()):
+            da.append((entries[i].key, entries[i].value))
+        return da
+
+    def __iter__(self):
+        """
+        Enables the hash map to iterate across itself. Builds the
+        iterator functionality inside the HashMap class.
+        """
+        self._index = 0
+        self._chain = iter(())
+        return self
+
+    def __next__(self):
+        """
+        Return the next entry in the hash map, from the table, then from
+        the stash, and then (as HashEntry snapshots) from the overflow
+        chains, based on the current location of the iterator.
+        """
+        while True:
+            i = self._index
+            if i < self._capacity:
+                self._index += 1
+                if self._slots[i] is not None:
+                    return self._slots[i]
+                continue
+            i -= self._capacity
+            if i < self._stash.length():
+                self._index += 1
+                return self._stash[i]
+
+            node = next(self._chain, None)
+            if node is not None:
+                return HashEntry(node.key, node.value, node.hash)
+            i -= self._stash.length()
+            if i == self._buckets:
+                raise StopIteration
+            self._index += 1
+            if self._overflow[i] is not None:
+                self._chain = iter(self._overflow[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nCuckoo - put example 1")
+    print("----------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nCuckoo - remove example 1")
+    print("-------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.contains_key('str0'), m.get('str1'))
+
+    print("\nCuckoo - resize example 1")
+    print("-------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nCuckoo - load and stash example 1")
+    print("---------------------------------")
+    for function in (hash_function_1, hash_function_2, builtin_hash):
+        m = HashMap(11, function)
+        for i in range(20000):
+            m.put('key' + str(i), i)
+        print(function.__name__, m.get_size(), m.get_capacity(),
+              round(m.table_load(), 2), 'stashed:', m._stash.length(),
+              'overflow:', m._overflow_size)
+
+    print("\nCuckoo - __iter__(), __next__() example 1")
+    print("-----------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
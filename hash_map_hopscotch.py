@@ -0,0 +1,465 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Implements a hashmap using open addressing with hopscotch
+#              hashing. Every entry is kept within a neighborhood of 32 slots
+#              from its home slot, which records in a bitmap the slots of its
+#              neighborhood holding its entries, so lookups only check those.
+#              Inserts move the nearest free slot back into the neighborhood
+#              by hopping entries forward within their own neighborhoods.
+
+from a6_include import (DynamicArray, HashEntry, LinkedList,
+                        hash_function_1, hash_function_2)
+from primes import is_prime, next_prime
+from hash_functions import finalized, fnv1a
+
+# Size of the neighborhood of a home slot.
+_NEIGHBORHOOD = 32
+
+# Below this load factor, an insert that finds no room in the neighborhood
+# is not worth growing the table for: it goes to the overflow chain of its
+# home slot instead (which only happens when many keys share a hash).
+_MIN_GROW_LOAD = 0.5
+
+
+class HashMap:
+    """
+    Hopscotch hashing HashMap with the same public API as the quadratic
+    probing HashMap of hash_map_oa. Keys, values and cached hashes are
+    held in parallel flat lists (an empty slot has no hash), next to the
+    neighborhood bitmap of each home slot: bit j is set when slot
+    home + j holds an entry of that home.
+
+    Lookups examine at most 32 slots, so the table can run at a load
+    factor of up to max_load (0.9 by default). Like hash_map_oa, the
+    capacity is a prime number, and the table grows to the next prime of
+    double its capacity. The hash function is finalized as in pow2 mode,
+    since keys with close hashes would otherwise crowd the same
+    neighborhoods. The only entries outside the neighborhoods are
+    those of a home slot that more than 32 keys hash to, which no table
+    size can separate: they are kept in a LinkedList for that home slot.
+    """
+
+    def __init__(self, capacity: int, function, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses
+        hopscotch hashing for collision resolution
+
+        max_load must be between 0 and 1 (exclusive): the table needs an
+        empty slot, and a load factor of 0 can not be reached by growing.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError('max_load must be between 0 and 1, not ' + repr(max_load))
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._allocate(self._capacity)
+
+        # Neighborhoods are contiguous, so the hash is run through a
+        # finalizer to spread keys with close hashes over the table.
+        self._hash_function = finalized(function)
+        self._max_load = max_load
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap.
+        """
+        out = ''
+        for i in range(self._capacity):
+            slot = None
+            if self._hashes[i] is not None:
+                slot = HashEntry(self._keys[i], self._values[i])
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def _growth_capacity(self) -> int:
+        """
+        Helper function that returns the capacity to grow the table to: the
+        next prime of double the current one.
+        """
+        return self._next_prime(2 * self._capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper function that allocates empty slot arrays, neighborhood
+        bitmaps and overflow chains of the given capacity.
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [None] * capacity
+        self._hops = [0] * capacity
+        self._overflow = [None] * capacity
+        self._overflow_size = 0
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Helper function that returns the index of the slot holding the key
+        given its hash, or -1 if it is not in the neighborhood of its home
+        slot (it may still be in the overflow chain). Only the slots set in
+        the neighborhood bitmap are compared.
+        """
+        m = self._capacity
+        home = hash % m
+        hop = self._hops[home]
+        while hop:
+            low = hop & -hop
+            i = home + low.bit_length() - 1
+            if i >= m:
+                i -= m
+            if self._hashes[i] == hash and self._keys[i] == key:
+                return i
+            hop ^= low
+        return -1
+
+    def _find_overflow(self, key: str, hash: int):
+        """
+        Helper function that returns the node of the key in the overflow
+        chain of its home slot, or None if it is not there.
+        """
+        chain = self._overflow[hash % self._capacity]
+        if chain is None:
+            return None
+        return chain.contains(key)
+
+    def _insert(self, key: str, value: object, hash: int) -> bool:
+        """
+        Helper function that places a key that is not in the hash map in the
+        neighborhood of its home slot. Returns False, leaving the entries
+        where they were or only hopped within their neighborhoods, if there
+        is no room for it. Does not change the size.
+
+        The nearest free slot after the home slot is found by linear
+        probing. While it is outside the neighborhood, an entry between the
+        home slot and the free slot, whose own neighborhood reaches the free
+        slot, is moved into it, freeing a slot nearer to the home slot.
+        """
+        keys, values, hashes, hops = self._keys, self._values, self._hashes, self._hops
+        m = self._capacity
+        home = hash % m
+
+        i, distance = home, 0
+        while hashes[i] is not None:
+            distance += 1
+            if distance == m:
+                return False
+            i = i + 1 if i + 1 < m else 0
+
+        while distance >= _NEIGHBORHOOD:
+            # Look for the entry furthest from the free slot that may move
+            # into it, from the home slots up to 31 slots before it.
+            for back in range(_NEIGHBORHOOD - 1, 0, -1):
+                owner = (i - back) % m
+                # ... its entries in the slots before the free one.
+                hop = hops[owner] & ((1 << back) - 1)
+                if hop:
+                    offset = (hop & -hop).bit_length() - 1
+                    j = (owner + offset) % m
+                    keys[i], values[i], hashes[i] = keys[j], values[j], hashes[j]
+                    keys[j] = values[j] = hashes[j] = None
+                    hops[owner] ^= (1 << offset) | (1 << back)
+                    distance -= back - offset
+                    i = j
+                    break
+            else:
+                return False
+
+        keys[i], values[i], hashes[i] = key, value, hash
+        hops[home] |= 1 << distance
+        return True
+
+    def _place(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that places a key that is not in the hash map in the
+        neighborhood of its home slot or, if there is no room for it, in the
+        overflow chain of its home slot. Does not change the size.
+        """
+        if self._insert(key, value, hash):
+            return
+        home = hash % self._capacity
+        if self._overflow[home] is None:
+            self._overflow[home] = LinkedList()
+        self._overflow[home].insert(key, value, hash)
+        self._overflow_size += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the given key
+        already exists in the hash map, its associated value is replaced
+        with the new value. If the given key is not in the hash map, a
+        new key/value pair is added.
+
+        The table is resized to double its current capacity (rounded up to
+        the next prime) when adding the pair would take
+        the slots held above max_load, or when the pair does not fit in the
+        neighborhood of its home slot (see _worth_growing()).
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            self._values[i] = value
+            return
+        node = self._find_overflow(key, hash)
+        if node is not None:
+            node.value = value
+            return
+
+        if (self._size - self._overflow_size + 1) / self._capacity > self._max_load:
+            self._rehash(self._growth_capacity())
+        if not self._insert(key, value, hash):
+            if self._worth_growing(hash):
+                self._rehash(self._growth_capacity())
+            self._place(key, value, hash)
+        self._size += 1
+
+    def _worth_growing(self, hash: int) -> bool:
+        """
+        Helper function that returns True if a key with the given hash, for
+        which there is no room in the neighborhood of its home slot, would
+        likely fit in a larger table: at least half the slots are full, and
+        fewer than half a neighborhood of keys share its home slot (with
+        the finalized hash, more of them almost always share the hash).
+        """
+        if (self._size - self._overflow_size) / self._capacity < _MIN_GROW_LOAD:
+            return False
+        return bin(self._hops[hash % self._capacity]).count('1') < _NEIGHBORHOOD // 2
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table. Without
+        tombstones, every slot not holding an entry is empty.
+        """
+        return self._capacity - self._size + self._overflow_size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. All existing
+        key/value pairs remain in the new hash map, and all hash table
+        links are rehashed.
+
+        The method does nothing if new_capacity less than the current
+        number of elements in the hash map. If new_capacity is valid,
+        checks if it is a prime number and makes it the next highest if not,
+        then keeps doubling it until the load factor is within max_load.
+        """
+        # Capacity must be larger than current number of elements.
+        if new_capacity < self._size:
+            return
+
+        # Capacity must be a prime number.
+        if not self._is_prime(new_capacity):
+            new_capacity = self._next_prime(new_capacity)
+
+        while self._size / new_capacity > self._max_load:
+            new_capacity = self._next_prime(2 * new_capacity)
+
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that places every entry, including those of the
+        overflow chains, into new arrays of the given (prime) capacity,
+        using the cached hashes. The hash map size does not change.
+        """
+        prev_keys, prev_values, prev_hashes = self._keys, self._values, self._hashes
+        prev_overflow = self._overflow
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        for k in range(len(prev_hashes)):
+            if prev_hashes[k] is not None:
+                self._place(prev_keys[k], prev_values[k], prev_hashes[k])
+            if prev_overflow[k] is not None:
+                for node in prev_overflow[k]:
+                    self._place(node.key, node.value, node.hash)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is
+        not in the hash map, the method returns None.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            return self._values[i]
+        if self._overflow_size:
+            node = self._find_overflow(key, hash)
+            if node is not None:
+                return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it
+        returns False. An empty hash map does not contain any keys.
+        """
+        if self._size == 0:
+            return False
+        hash = self._hash_function(key)
+        if self._find(key, hash) != -1:
+            return True
+        return self._overflow_size > 0 and self._find_overflow(key, hash) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        If the key is not in the hash map, the method does nothing.
+
+        The slot is simply emptied and dropped from the neighborhood bitmap
+        of its home slot; no tombstone is needed.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            home = hash % self._capacity
+            self._hops[home] ^= 1 << ((i - home) % self._capacity)
+            self._keys[i] = self._values[i] = self._hashes[i] = None
+            self._size -= 1
+            return
+
+        home = hash % self._capacity
+        chain = self._overflow[home]
+        if chain is not None and chain.remove(key):
+            if chain.length() == 0:
+                self._overflow[home] = None
+            self._overflow_size -= 1
+            self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the
+        underlying hash table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map. The results are unsorted.
+        """
+        da = DynamicArray()
+        for entry in self:
+            da.append((entry.key, entry.value))
+        return da
+
+    def __iter__(self):
+        """
+        Enables the hash map to iterate across itself. Builds the
+        iterator functionality inside the HashMap class.
+        """
+        self._index = 0
+        self._chain = iter(())
+        return self
+
+    def __next__(self):
+        """
+        Return a HashEntry snapshot of the next entry in the hash map, from
+        the slots and the overflow chains, based on the current location of
+        the iterator.
+        """
+        while True:
+            node = next(self._chain, None)
+            if node is not None:
+                return HashEntry(node.key, node.value, node.hash)
+            if self._index == self._capacity:
+                raise StopIteration
+            i = self._index
+            self._index += 1
+            if self._overflow[i] is not None:
+                self._chain = iter(self._overflow[i])
+            if self._hashes[i] is not None:
+                return HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nHopscotch - put example 1")
+    print("-------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nHopscotch - remove example 1")
+    print("----------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.contains_key('str0'), m.get('str1'))
+
+    print("\nHopscotch - resize example 1")
+    print("----------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nHopscotch - high load example 1")
+    print("-------------------------------")
+    m = HashMap(1009, fnv1a)
+    for i in range(900):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2),
+          all(m.get('key' + str(i)) == i for i in range(900)))
+
+    print("\nHopscotch - __iter__(), __next__() example 1")
+    print("--------------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -6,27 +6,102 @@
 # Description:  Implements a hashmap using open addressing with quadratic probing
 #               for collision resolution inside the dynamic array.
 
+import copy
+import time
+
 from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+                        SlottedDynamicArray, SlottedHashEntry, raw_buffer,
+                        hash_function_1, hash_function_2, batch_hash)
+from primes import is_prime, next_prime
+from map_stats import MapStats
+from hash_functions import finalized
+
+# Tombstone left in the slots of a table being drained by an incremental
+# resize, in place of the entries moved out of them.
+_MOVED = HashEntry(None, None)
+_MOVED.is_tombstone = True
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # Number of slots moved out of the table being drained on each operation
+    # while an incremental resize is in progress.
+    _MIGRATE_SLOTS = 8
+
+    # Set to True (on the class or on an instance) to have empty_buckets()
+    # and tombstone_ratio() cross-check the occupancy counters against a
+    # full scan of the table, raising AssertionError if they disagree.
+    verify_counters = False
+
+    # With the shrink policy on, the table shrinks once the load factor
+    # falls below this, well under the 0.5 that makes it grow.
+    _SHRINK_LOAD = 0.125
+
+    def __init__(self, capacity: int, function, incremental: bool = False,
+                 lazy_clear: bool = False, shrink: bool = False,
+                 pow2: bool = False, slotted: bool = False) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        If incremental is True, automatic resizes move the entries over to
+        the new table a few slots at a time on each subsequent operation,
+        instead of all at once inside the put() that triggered them.
+
+        If lazy_clear is True, clear() runs in constant time: each slot is
+        stamped with the generation it was written in, clear() starts a new
+        generation, and slots from older generations are treated as empty
+        and reset when they are next reached.
+
+        If shrink is True, removals shrink the table once the load factor
+        falls below 0.125, down to no less than the initial capacity.
+
+        If pow2 is True, capacities are powers of two instead of primes:
+        slots are indexed by masking the low bits of the hash, which is run
+        through a finalizer so those bits are well mixed, and probing is
+        triangular (offsets 1, 3, 6, 10, ...), which visits every slot of a
+        power-of-two table.
+
+        If slotted is True, the table and its entries are built from the
+        __slots__ versions of DynamicArray and HashEntry, which have no
+        per-instance __dict__ and take less memory per key.
         """
-        self._buckets = DynamicArray()
+        # Storage types: the slotted versions, or the plain ones.
+        self._array_type = SlottedDynamicArray if slotted else DynamicArray
+        self._entry_type = SlottedHashEntry if slotted else HashEntry
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        # Lazy clearing: the current generation, stamped on every slot of
+        # the table (in self._stamps) when it is allocated or reset.
+        self._lazy_clear = lazy_clear
+        self._generation = 0
 
-        self._hash_function = function
+        # Capacity policy: the increase of the probe step from one probe to
+        # the next, 2 for quadratic probing and 1 for triangular probing.
+        self._pow2 = pow2
+        self._step_increase = 1 if pow2 else 2
+
+        # capacity must be a prime number (or a power of two in pow2 mode)
+        self._capacity = self._next_capacity(capacity)
+        self._allocate(self._capacity)
+
+        # Shrink policy, and the capacity it never shrinks below.
+        self._shrink = shrink
+        self._min_capacity = self._capacity
+
+        self._hash_function = finalized(function) if pow2 else function
         self._size = 0
 
+        # Number of removed entries still occupying a slot as a tombstone.
+        self._tombstones = 0
+
+        # Incremental resizing: the old table still being drained (a shallow
+        # copy of this map, or None), and the next slot to move out of it.
+        self._incremental = incremental
+        self._draining = None
+        self._migrate_index = 0
+
+        # Instrumentation counters (a MapStats), or None while disabled.
+        self._stats = None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -40,35 +115,34 @@ class HashMap:
     def _next_prime(self, capacity: int) -> int:
         """
         Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
+        return is_prime(capacity)
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+    def _next_capacity(self, capacity: int) -> int:
+        """
+        Helper function that returns the smallest valid capacity of at least
+        the given one: a power of two in pow2 mode, otherwise an odd prime.
+        """
+        if self._pow2:
+            return 1 << max(capacity - 1, 0).bit_length()
+        return self._next_prime(capacity)
 
-        return True
+    def _growth_capacity(self) -> int:
+        """
+        Helper function that returns the capacity to grow the table to:
+        double the current one in pow2 mode, otherwise the next prime of
+        double the current one.
+        """
+        if self._pow2:
+            return 2 * self._capacity
+        return self._next_prime(2 * self._capacity)
 
     def get_size(self) -> int:
         """
@@ -85,44 +159,222 @@ class HashMap:
         return self._capacity
 
     # ------------------------------------------------------------------ #
-    def find_slot(self, key: str) -> int:
-        """
-        Helper function to find the index of key, if present in the hashmap. If the
-        key is not present, it returns the index of the first empty slot instead.
-        Uses quadratic probing.
-        """
-        # Search until we either find the key or find an empty slot using
-        # quadratic probing.
-        i_initial = i = self._hash_function(key) % self._capacity
-        j = 1
-        while True:
-            # ... if we find an empty slot.
-            if self._buckets[i] is None:
-                break
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper function that allocates an empty table of the given capacity.
+        """
+        self._buckets = self._array_type([None] * capacity)
+        self._empty_slots = capacity
+        if self._lazy_clear:
+            self._stamps = [self._generation] * capacity
+
+    def _is_empty(self, i: int) -> bool:
+        """Helper function that returns True if slot i is empty."""
+        return raw_buffer(self._buckets)[i] is None
+
+    def _reset(self, i: int) -> None:
+        """
+        Helper function that empties slot i, whatever it holds. Does not
+        change the size or the counters.
+        """
+        raw_buffer(self._buckets)[i] = None
+
+    def _refresh_path(self, hash: int) -> None:
+        """
+        Helper function for the lazy clear mode that walks the probe
+        sequence of the hash up to where a probe would stop, resetting the
+        first slot left over from before the last clear() on the way, so
+        the probe then sees it as empty.
+        """
+        stamps = self._stamps
+        generation = self._generation
+        m = self._capacity
+        i = hash & (m - 1) if self._pow2 else hash % m
+        step, increase = 1, self._step_increase
+        for _ in range(m):
+            if stamps[i] != generation:
+                self._reset(i)
+                stamps[i] = generation
+                return
+            if self._is_empty(i):
+                return
+            i = (i + step) % m
+            step += increase
+
+    def _sweep(self) -> None:
+        """
+        Helper function for the lazy clear mode that resets every slot left
+        over from before the last clear(). Called before the operations that
+        walk the whole table.
+        """
+        if not self._lazy_clear:
+            return
+        stamps = self._stamps
+        generation = self._generation
+        for i in range(self._capacity):
+            if stamps[i] != generation:
+                self._reset(i)
+                stamps[i] = generation
+
+    def _scan_occupancy(self) -> (int, int):
+        """
+        Helper function that counts the empty slots and the tombstones with
+        a full scan of the table.
+        """
+        empty = tombstones = 0
+        for entry in raw_buffer(self._buckets):
+            if entry is None:
+                empty += 1
+            elif entry.is_tombstone:
+                tombstones += 1
+        return empty, tombstones
+
+    def _verify_counters(self) -> None:
+        """
+        Helper function that raises AssertionError if the empty slot and
+        tombstone counters do not match a full scan of the table.
+        """
+        self._sweep()
+        scanned = self._scan_occupancy()
+        if scanned != (self._empty_slots, self._tombstones):
+            raise AssertionError('occupancy counters ' +
+                                 str((self._empty_slots, self._tombstones)) +
+                                 ' do not match the table ' + str(scanned))
+
+    def _probe(self, key: str, hash: int) -> (int, int):
+        """
+        Fused probe engine. Walks the quadratic probe sequence of the key a
+        single time, and returns a tuple of the index of the matching live
+        entry (-1 if the key is not present) and the index of the first
+        reusable slot on the path, which is either the first tombstone passed
+        or the empty slot that ended the search (-1 if there is none).
+        """
+        if self._lazy_clear:
+            self._refresh_path(hash)
+
+        # Every index below is reduced modulo the capacity, the length of
+        # the table, so the slots are read straight from its buffer.
+        buckets = raw_buffer(self._buckets)
+        m = self._capacity
+        i = hash & (m - 1) if self._pow2 else hash % m
+        step, increase = 1, self._step_increase
+        avail = -1
+        for j in range(1, m + 1):
+            entry = buckets[i]
+            # ... if we find an empty slot, the key is not in the hashmap.
+            if entry is None:
+                if avail == -1:
+                    avail = i
+                if self._stats is not None:
+                    self._stats.record_probe(False, j)
+                return -1, avail
+            # ... remember the first tombstone so an insert can reuse it.
+            if entry.is_tombstone:
+                if avail == -1:
+                    avail = i
             # ... if we find the key and the entry is not a tombstone.
-            if self._buckets[i].is_tombstone is False and self._buckets[i].key == key:
-                break
-            i = (i_initial + j ** 2) % self._capacity
-            j += 1
-        return i
-
-    def find_first_avail_slot(self, key: str) -> int:
-        """
-        Helper function to find the index of first available slot, which can be
-        either an empty slot (None) or tombstone.
-        Uses quadratic probing.
-        """
-        # Search until we either find the key or find an empty slot using
-        # quadratic probing.
-        i_initial = i = self._hash_function(key) % self._capacity
-        j = 1
-        while True:
-            # ... if we find an empty slot or tombstone.
-            if self._buckets[i] is None or self._buckets[i].is_tombstone:
+            elif entry.hash == hash and entry.key == key:
+                if self._stats is not None:
+                    self._stats.record_probe(True, j)
+                return i, avail
+            # ... step to the next slot: the offsets from the first slot
+            # are j ** 2 (quadratic) or j * (j + 1) / 2 (triangular).
+            i = (i + step) % m
+            step += increase
+        if self._stats is not None:
+            self._stats.record_probe(False, m)
+        return -1, avail
+
+    def _probe_group(self, hash: int, wanted: dict, found: list) -> None:
+        """
+        Probe engine for the batch methods, for a group of keys that share
+        the home slot of the given hash, and so their probe sequence. Walks
+        it a single time, up to the first empty slot or until every key was
+        found. wanted maps the (hash, key) pair of each key to its positions
+        in the batch, and the index of the slot holding the key is stored
+        at those positions of found.
+        """
+        if self._lazy_clear:
+            self._refresh_path(hash)
+
+        buckets = raw_buffer(self._buckets)
+        m = self._capacity
+        i = hash & (m - 1) if self._pow2 else hash % m
+        step, increase = 1, self._step_increase
+        length = m
+        for j in range(1, m + 1):
+            entry = buckets[i]
+            if entry is None:
+                length = j
                 break
-            i = (i_initial + j ** 2) % self._capacity
-            j += 1
-        return i
+            if not entry.is_tombstone:
+                positions = wanted.pop((entry.hash, entry.key), None)
+                if positions is not None:
+                    for position in positions:
+                        found[position] = i
+                        if self._stats is not None:
+                            self._stats.record_probe(True, j)
+                    if not wanted:
+                        return
+            i = (i + step) % m
+            step += increase
+        if self._stats is not None:
+            for positions in wanted.values():
+                for _ in positions:
+                    self._stats.record_probe(False, length)
+
+    def _store(self, i: int, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that fills slot i, which is either empty or a
+        tombstone, with the key/value pair. Does not change the size.
+        """
+        buckets = raw_buffer(self._buckets)
+        entry = buckets[i]
+        # ...if we have an empty slot, insert a new hash entry.
+        if entry is None:
+            buckets[i] = self._entry_type(key, value, hash)
+            self._empty_slots -= 1
+        # ...otherwise, we have a tombstone value, so update the key/value
+        # and unmake the tombstone.
+        else:
+            entry.key = key
+            entry.value = value
+            entry.hash = hash
+            entry.is_tombstone = False
+            self._tombstones -= 1
+            if self._stats is not None:
+                self._stats.record_tombstone_reuse()
+
+    def _kill(self, i: int) -> None:
+        """
+        Helper function that turns the live entry in slot i into a
+        tombstone. Does not change the size.
+        """
+        raw_buffer(self._buckets)[i].is_tombstone = True
+        self._tombstones += 1
+
+    def _evict(self, i: int) -> tuple:
+        """
+        Helper function that returns the (key, value, hash) tuple of the
+        live entry in slot i and leaves the shared _MOVED tombstone in its
+        place, or returns None if the slot is empty or a tombstone. Does not
+        change the size.
+        """
+        buckets = raw_buffer(self._buckets)
+        entry = buckets[i]
+        if entry is None or entry.is_tombstone:
+            return None
+        buckets[i] = _MOVED
+        self._tombstones += 1
+        return entry.key, entry.value, entry.hash
+
+    def _value_at(self, i: int) -> object:
+        """Helper function that returns the value of the live entry in slot i."""
+        return raw_buffer(self._buckets)[i].value
+
+    def _set_value(self, i: int, value: object) -> None:
+        """Helper function that sets the value of the live entry in slot i."""
+        raw_buffer(self._buckets)[i].value = value
 
     def put(self, key: str, value: object) -> None:
         """
@@ -131,61 +383,113 @@ class HashMap:
         with the new value. If the given key is not in the hash map, a
         new key/value pair is added.
 
-        The table is resized to double its current capacity when this
-        method is called and the current load factor of the table is
-        greater than or equal to 0.5.
+        The table is resized to double its current capacity (rounded up to
+        the next prime) when this method is called and the current load
+        factor of the table is greater than or equal to 0.5. Otherwise, if
+        live entries and tombstones together fill 3/4 of the table, the
+        tombstones are purged by rehashing in place at the same capacity.
         """
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS)
+
         # Check the load factor and double the array size if it exceeds 0.5.
         if self.table_load() >= 0.5:
-            self.resize_table(2 * self._capacity)
+            self._resize(self._growth_capacity())
+        # Check the occupied slots (live and dead), and purge if needed.
+        elif (self._size + self._tombstones) / self._capacity >= 0.75:
+            self._resize(self._capacity)
 
-        # Get the initial hash. If the slot is empty, insert and return.
-        i = self._hash_function(key) % self._capacity
-        if self._buckets[i] is None:
-            self._buckets[i] = HashEntry(key, value)
-            self._size += 1
-            return
+        self._put(key, value, self._hash_function(key))
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that updates or inserts the key/value pair given the
+        hash of the key. Does not check the load factor.
+        """
+        # Walk the probe sequence a single time.
+        found, avail = self._probe(key, hash)
 
-        # Otherwise use quadratic probing to find our key in the hashmap.
-        # Note: status will be either true or false.
-        status = self.contains_key(key)
         # ...if we find the key, update the value and return.
-        if status:
-            i = self.find_slot(key)
-            self._buckets[i].value = value
-            return
-        # ...otherwise, find the first available slot to place our key/value.
-        else:
-            i = self.find_first_avail_slot(key)
-            # ...if we have an empty slot, insert a new hash entry.
-            if self._buckets[i] is None:
-                self._buckets[i] = HashEntry(key, value)
-            # ...otherwise, we have a tombstone value, so update the key/value
-            # and unmake the tombstone.
-            else:
-                self._buckets[i].key = key
-                self._buckets[i].value = value
-                self._buckets[i].is_tombstone = False
-            self._size += 1
+        if found != -1:
+            self._set_value(found, value)
             return
 
+        # ...if the key is still waiting in the old table, update it there.
+        if self._draining is not None:
+            found, _ = self._draining._probe(key, hash)
+            if found != -1:
+                self._draining._set_value(found, value)
+                return
+
+        # ...otherwise, place our key/value in the first available slot.
+        self._store(avail, key, value, hash)
+        self._size += 1
+
     def table_load(self) -> float:
         """
         Returns the current hash table load factor.
         """
         return self._size/self._capacity
 
+    def tombstone_ratio(self) -> float:
+        """
+        Returns the fraction of the hash table slots that are held by
+        tombstones.
+        """
+        if self.verify_counters:
+            self._verify_counters()
+        return self._tombstones/self._capacity
+
+    def enable_stats(self, hook=None, long_probe: int = 16) -> None:
+        """
+        Starts recording probe lengths, resizes and tombstone reuse, with
+        fresh counters. If a hook is given, it is called as hook(event,
+        details) after each resize and each probe of long_probe or more
+        slots. See MapStats.
+        """
+        self._stats = MapStats(hook, long_probe)
+        if self._draining is not None:
+            self._draining._stats = self._stats
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording and drops the counters.
+        """
+        self._stats = None
+        if self._draining is not None:
+            self._draining._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the hash table occupancy and, if enabled, of
+        the recorded counters (which are zero otherwise).
+        """
+        snapshot = {
+            'enabled': self._stats is not None,
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'tombstones': self._tombstones,
+            'tombstone_ratio': self.tombstone_ratio(),
+            'resizing': self._draining is not None,
+        }
+        snapshot.update((self._stats or MapStats()).snapshot())
+        return snapshot
+
     def empty_buckets(self) -> int:
         """
         Returns the number of empty buckets in the hash table.
+
+        During an incremental resize, the count is that of the table once
+        the old one is drained: every entry still waiting in the old table
+        (counted by its size) will fill one empty slot, as _migrate() never
+        places entries on tombstones.
         """
-        # Count the empty buckets.
-        count = 0
-        for i in range(self._capacity):
-            bucket = self._buckets[i]
-            if bucket is None:
-                count += 1
-        return count
+        if self.verify_counters:
+            self._verify_counters()
+        if self._draining is None:
+            return self._empty_slots
+        return self._empty_slots - self._draining._size
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -196,56 +500,179 @@ class HashMap:
         The method does nothing if new_capacity less than the current
         number of elements in the hash map. If new_capacity is valid,
         checks if it is a prime number and makes it the next highest if not.
+        Explicit resizes always take place at once, even in incremental mode.
         """
         # Capacity must be larger than current number of elements.
         if new_capacity < self._size:
             return
 
-        # Capacity must be a prime number.
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Capacity must be a prime number (or a power of two in pow2 mode).
+        if self._pow2 or not self._is_prime(new_capacity):
+            new_capacity = self._next_capacity(new_capacity)
 
-        # DYNAMIC ARRAY IMPLEMENTATION 1
-        # Save the previous buckets.
-        prev_buckets = self._buckets
+        # Keep doubling the target until the rehashed table respects the
+        # max load factor, so no resize is needed part way through.
+        while (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_capacity(2 * new_capacity)
 
-        # Initialize new dynamic array with the new capacity, and reset
-        # the size attribute.
-        self._buckets = DynamicArray()
+        self._finish_resize()
+        self._rehash(new_capacity)
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Helper function for the automatic resizes, which moves every live
+        entry into a table of the given (prime) capacity. In incremental
+        mode, this only sets up the new table, and the entries are moved
+        over by _migrate() on the following operations.
+        """
+        # Only one incremental resize can be in progress at a time, and the
+        # table being drained must not hold slots from before a clear().
+        self._finish_resize()
+        self._sweep()
+
+        if not self._incremental:
+            self._rehash(new_capacity)
+            return
+
+        # The old table lives on in a shallow copy of this map, which keeps
+        # the current storage while this map switches to the new table.
+        start = time.perf_counter()
+        self._draining = copy.copy(self)
+        self._allocate(new_capacity)
         self._capacity = new_capacity
-        for _ in range(self._capacity):
-            self._buckets.append(None)
-        self._size = 0
+        self._tombstones = 0
+        self._migrate_index = 0
+        if self._stats is not None:
+            self._stats.record_resize(self._draining._capacity, new_capacity,
+                                      time.perf_counter() - start)
 
-        # Loop over the previous buckets, copying over key/value pairs
-        # to the new hashmap wherever a valid (non-tombstone) item is found.
-        for i in range(prev_buckets.length()):
-            slot = prev_buckets[i]
-            if slot is not None or (slot is not None and slot.is_tombstone is False):
-                self.put(slot.key, slot.value)
-
-        # # HASHMAP IMPLEMENTATION 2 (Alternative)
-        # # Rehash all buckets into new hashmap.
-        # hashmap = HashMap(new_capacity, self._hash_function)
-        # for i in range(self._capacity):
-        #     bucket = self._buckets[i]
-        #     # Bypass empty buckets and tombstones.
-        #     if bucket is not None and bucket.is_tombstone is False:
-        #         hashmap.put(bucket.key, bucket.value)
-        #
-        # # Copy new hashmap buckets and attributes to current.
-        # self._buckets = hashmap._buckets
-        # self._capacity = hashmap._capacity
-        # self._size = hashmap._size
+    def _shrink_if_sparse(self) -> None:
+        """
+        Helper function for the shrink policy. Once the load factor falls
+        below 0.125, resizes the table to the next prime of 4 times the
+        size (but no less than the initial capacity), which puts the load
+        factor back halfway to the growth threshold of 0.5. The gap between
+        the two keeps a map that hovers around one size from resizing back
+        and forth.
+        """
+        if self.table_load() >= self._SHRINK_LOAD:
+            return
+        new_capacity = self._next_capacity(max(4 * self._size, self._min_capacity))
+        if new_capacity < self._capacity:
+            self._resize(new_capacity)
+
+    def _migrate(self, count: int) -> None:
+        """
+        Helper function that moves the live entries of the next count slots
+        of the table being drained into the current table. Moved entries are
+        left behind as tombstones, so probing the old table never finds them,
+        and are freed as the migration goes rather than all at once with the
+        old table.
+
+        Each entry goes to the first empty slot of its probe sequence, as in
+        _rehash(), and the size of the old table counts the entries still
+        waiting in it, which keeps empty_buckets() exact in O(1) time.
+        """
+        stats = self._stats
+        clock = time.perf_counter() if stats is not None else 0.0
+        old = self._draining
+        start = self._migrate_index
+        end = min(start + count, old._capacity)
+        m = self._capacity
+        increase = self._step_increase
+        for k in range(start, end):
+            slot = old._evict(k)
+            if slot is not None:
+                key, value, hash = slot
+                i = hash % m
+                step = 1
+                while not self._is_empty(i):
+                    i = (i + step) % m
+                    step += increase
+                self._store(i, key, value, hash)
+                old._size -= 1
+        self._migrate_index = end
+        if stats is not None:
+            stats.record_migration(time.perf_counter() - clock)
+
+        # The old table is empty once every slot has been visited.
+        if end == old._capacity:
+            self._draining = None
+
+    def _finish_resize(self) -> None:
+        """
+        Helper function that completes an incremental resize in progress.
+        """
+        if self._draining is not None:
+            self._migrate(self._draining._capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that moves every live entry into a new table of the
+        given (prime) capacity. Entries are placed on the first empty slot of
+        their probe sequence using the hash cached on each entry, so no key
+        is hashed again and the load factor is not re-checked. Tombstones
+        are dropped, and the hash map size does not change.
+
+        Also used with the current capacity to purge tombstones in place.
+        """
+        # Save the previous buckets and capacity.
+        start = time.perf_counter()
+        self._sweep()
+        prev_buckets = raw_buffer(self._buckets)
+        prev_capacity = self._capacity
+
+        # Initialize new dynamic array with the new capacity.
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._tombstones = 0
+
+        # Loop over the previous buckets, moving the live (non-tombstone)
+        # entries over to the new buckets. Every key is distinct, so the
+        # first empty slot on the probe sequence is where it belongs.
+        # Note: for a power-of-two capacity, % is the same as masking.
+        buckets = raw_buffer(self._buckets)
+        m = new_capacity
+        increase = self._step_increase
+        for entry in prev_buckets:
+            if entry is None or entry.is_tombstone:
+                continue
+            i = entry.hash % m
+            step = 1
+            while buckets[i] is not None:
+                i = (i + step) % m
+                step += increase
+            buckets[i] = entry
+
+        # Every live entry was moved over (no resize is in progress here).
+        self._empty_slots = new_capacity - self._size
+
+        if self._stats is not None:
+            self._stats.record_resize(prev_capacity, new_capacity,
+                                      time.perf_counter() - start)
 
     def get(self, key: str) -> object:
         """
         Returns the value associated with the given key. If the key is
         not in the hash map, the method returns None.
         """
-        if self.contains_key(key):
-            i = self.find_slot(key)
-            return self._buckets[i].value
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS)
+
+        return self._get(key, self._hash_function(key))
+
+    def _get(self, key: str, hash: int) -> object:
+        """
+        Helper function that returns the value associated with the key given
+        its hash, or None if the key is not in the hash map.
+        """
+        found, _ = self._probe(key, hash)
+        if found != -1:
+            return self._value_at(found)
+
+        # Check the old table too while it is being drained.
+        if self._draining is not None:
+            return self._draining._get(key, hash)
 
     def contains_key(self, key: str) -> bool:
         """
@@ -255,42 +682,69 @@ class HashMap:
         if self._size == 0:
             return False
 
-        m = self._capacity
-        i_initial = i = self._hash_function(key) % m
-        j = 1
-        while True:
-            # ... if we find an empty slot.
-            if self._buckets[i] is None:
-                return False
-            # ... if we find the key and the entry is not a tombstone.
-            if not self._buckets[i].is_tombstone and self._buckets[i].key == key:
-                return True
-            i = (i_initial + j ** 2) % m
-            j += 1
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS)
+
+        return self._contains(key, self._hash_function(key))
+
+    def _contains(self, key: str, hash: int) -> bool:
+        """
+        Helper function that returns True if the key is in the hash map
+        given its hash, otherwise False.
+        """
+        found, _ = self._probe(key, hash)
+        if found != -1:
+            return True
+
+        # Check the old table too while it is being drained.
+        if self._draining is not None:
+            return self._draining._contains(key, hash)
+        return False
 
     def remove(self, key: str) -> None:
         """
         Removes the given key and its associated value from the hash map.
         If the key is not in the hash map, the method does nothing.
         """
-        i = self.find_slot(key)
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS)
 
-        # Do nothing if the key is not in the hashmap.
-        if self._buckets[i] is None:
-            return
+        if self._remove(key, self._hash_function(key)) and self._shrink:
+            self._shrink_if_sparse()
+
+    def _remove(self, key: str, hash: int) -> bool:
+        """
+        Helper function that removes the key given its hash, if present.
+        Returns True if the key was removed, otherwise False.
+        """
+        found, _ = self._probe(key, hash)
+
+        # If we find the key, make it a tombstone and decrement the size.
+        if found != -1:
+            self._kill(found)
+            self._size -= 1
+            return True
 
-        # Otherwise, set the tombstone to true and decrement hash map size.
-        self._buckets[i].is_tombstone = True
-        self._size -= 1
+        # Otherwise, the key may still be waiting in the old table.
+        if self._draining is not None and self._draining._remove(key, hash):
+            self._size -= 1
+            return True
+        return False
 
     def clear(self) -> None:
         """
         Clears the contents of the hash map. It does not change the
         underlying hash table capacity.
         """
-        for i in range(self._capacity):
-            self._buckets[i] = None
+        self._draining = None
+        if self._lazy_clear:
+            # Start a new generation; the old slots are reset as reached.
+            self._generation += 1
+            self._empty_slots = self._capacity
+        else:
+            self._allocate(self._capacity)
         self._size = 0
+        self._tombstones = 0
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -303,12 +757,153 @@ class HashMap:
                 da.append((slot.key, slot.value))
         return da
 
+    def put_many(self, pairs) -> None:
+        """
+        Updates the hash map with every key/value pair of the given iterable,
+        as if put() was called on each pair in order.
+
+        The table is resized once, up front, to the smallest prime capacity
+        that holds every pair below the max load factor of 0.5, so there is
+        no resizing while the pairs are inserted.
+        """
+        pairs = list(pairs)
+        self._finish_resize()
+
+        # Size for the worst case where every key is new, or purge the
+        # tombstones if the new pairs would push the occupied slots too far.
+        count = self._size + len(pairs)
+        if 2 * count - 1 > self._capacity:
+            self.resize_table(2 * count - 1)
+        elif (count + self._tombstones) / self._capacity >= 0.75:
+            self._rehash(self._capacity)
+
+        # Hash the whole batch of keys in one call.
+        hashes = batch_hash(self._hash_function, [key for key, _ in pairs])
+        for (key, value), hash in zip(pairs, hashes):
+            self._put(key, value, hash)
+
+    @classmethod
+    def from_pairs(cls, pairs, function=hash_function_1) -> "HashMap":
+        """
+        Builds a new hash map from an iterable of key/value pairs. The table
+        is sized once for all of the pairs.
+        """
+        hash_map = cls(1, function)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def _find_many(self, keys: list, hashes: list) -> list:
+        """
+        Helper function for the batch methods that returns, for each of the
+        given keys in order, the index of the slot of the current table
+        holding it, or -1 if it is not there. The keys are grouped by home
+        slot, and the probe sequence of each group is walked once.
+        """
+        # Note: for a power-of-two capacity, % is the same as masking.
+        m = self._capacity
+        groups = {}
+        for position, hash in enumerate(hashes):
+            groups.setdefault(hash % m, []).append(position)
+
+        found = [-1] * len(keys)
+        probe = self._probe
+        for positions in groups.values():
+            if len(positions) == 1:
+                position = positions[0]
+                found[position] = probe(keys[position], hashes[position])[0]
+                continue
+            wanted = {}
+            for position in positions:
+                wanted.setdefault((hashes[position], keys[position]), []).append(position)
+            self._probe_group(hashes[positions[0]], wanted, found)
+        return found
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys,
+        in order, or None for the keys not in the hash map. The keys are
+        hashed in one batch and looked up home slot by home slot.
+        """
+        keys = list(keys)
+        values = [None] * len(keys)
+        if self._size == 0:
+            return values
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        value_at = self._value_at
+        for position, i in enumerate(self._find_many(keys, hashes)):
+            if i != -1:
+                values[position] = value_at(i)
+            elif self._draining is not None:
+                values[position] = self._draining._get(keys[position], hashes[position])
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        Returns a list with, for each of the given keys in order, True if the
+        key is in the hash map and False otherwise. The keys are hashed in
+        one batch and looked up home slot by home slot.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return [False] * len(keys)
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        found = self._find_many(keys, hashes)
+        for position, i in enumerate(found):
+            if i == -1 and self._draining is not None:
+                found[position] = self._draining._contains(keys[position], hashes[position])
+            else:
+                found[position] = i != -1
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the
+        hash map, skipping keys that are not in the hash map. The keys are
+        hashed in one batch and looked up home slot by home slot.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_SLOTS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        removed = set()
+        for position, i in enumerate(self._find_many(keys, hashes)):
+            if i != -1:
+                # A key given more than once is only removed once.
+                if i not in removed:
+                    removed.add(i)
+                    self._kill(i)
+                    self._size -= 1
+            elif self._draining is not None:
+                if self._draining._remove(keys[position], hashes[position]):
+                    self._size -= 1
+
+        if self._shrink:
+            self._shrink_if_sparse()
+
     def __iter__(self):
         """
         Enables the hash map to iterate across itself. Builds the
         iterator functionality inside the HashMap class.
+
+        During an incremental resize, the entries still waiting in the old
+        table follow those of the current table.
         """
+        self._sweep()
         self._index = 0
+        if self._draining is not None:
+            iter(self._draining)
         return self
 
     def __next__(self):
@@ -316,15 +911,283 @@ class HashMap:
         Return the next item in the hash map, based on the current
         location of the iterator.
         """
-        while True:
-            if self._index == self._capacity:
-                raise StopIteration
-            slot = self._buckets[self._index]
+        buckets = raw_buffer(self._buckets)
+        while self._index < self._capacity:
+            slot = buckets[self._index]
             self._index += 1
             if slot is not None and not slot.is_tombstone:
+                return slot
+
+        # ...then the entries still waiting in the old table, if resizing.
+        if self._draining is None:
+            raise StopIteration
+        return next(self._draining)
+
+
+# Slot states of the struct-of-arrays storage engine.
+_EMPTY, _LIVE, _TOMBSTONE = 0, 1, 2
+
+
+class SoAHashMap(HashMap):
+    """
+    Open addressing HashMap with a struct-of-arrays storage engine. Keys,
+    values and cached hashes are held in parallel flat lists, and the state
+    of each slot (empty, live or tombstone) in a bytearray, instead of one
+    HashEntry object per slot inside a DynamicArray.
+
+    Has the same public API and probing/resizing behaviour as HashMap, so
+    it can be used as a drop-in replacement. Iteration yields HashEntry
+    snapshots of the live slots. The slotted option is not supported, as
+    there are no per-slot objects to slot.
+    """
+
+    def __init__(self, capacity: int, function, incremental: bool = False,
+                 lazy_clear: bool = False, shrink: bool = False,
+                 pow2: bool = False) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution, with struct-of-arrays storage
+        """
+        super().__init__(capacity, function, incremental, lazy_clear, shrink, pow2)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper function that allocates empty slot arrays of the given capacity.
+        """
+        self._states = bytearray(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [None] * capacity
+        self._empty_slots = capacity
+        if self._lazy_clear:
+            self._stamps = [self._generation] * capacity
+
+    def _is_empty(self, i: int) -> bool:
+        """Helper function that returns True if slot i is empty."""
+        return self._states[i] == _EMPTY
+
+    def _reset(self, i: int) -> None:
+        """
+        Helper function that empties slot i, whatever it holds. Does not
+        change the size or the counters.
+        """
+        self._states[i] = _EMPTY
+        self._keys[i] = self._values[i] = self._hashes[i] = None
+
+    def _scan_occupancy(self) -> (int, int):
+        """
+        Helper function that counts the empty slots and the tombstones with
+        a full scan of the slot states.
+        """
+        return self._states.count(_EMPTY), self._states.count(_TOMBSTONE)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap.
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                slot = None
+            else:
+                slot = HashEntry(self._keys[i], self._values[i])
+                slot.is_tombstone = self._states[i] == _TOMBSTONE
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def _probe(self, key: str, hash: int) -> (int, int):
+        """
+        Fused probe engine over the slot arrays. Same contract as
+        HashMap._probe().
+        """
+        if self._lazy_clear:
+            self._refresh_path(hash)
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        m = self._capacity
+        i = hash & (m - 1) if self._pow2 else hash % m
+        step, increase = 1, self._step_increase
+        avail = -1
+        for j in range(1, m + 1):
+            state = states[i]
+            # ... if we find an empty slot, the key is not in the hashmap.
+            if state == _EMPTY:
+                if avail == -1:
+                    avail = i
+                if self._stats is not None:
+                    self._stats.record_probe(False, j)
+                return -1, avail
+            # ... remember the first tombstone so an insert can reuse it.
+            if state == _TOMBSTONE:
+                if avail == -1:
+                    avail = i
+            # ... if we find the key and the entry is not a tombstone.
+            elif hashes[i] == hash and keys[i] == key:
+                if self._stats is not None:
+                    self._stats.record_probe(True, j)
+                return i, avail
+            i = (i + step) % m
+            step += increase
+        if self._stats is not None:
+            self._stats.record_probe(False, m)
+        return -1, avail
+
+    def _probe_group(self, hash: int, wanted: dict, found: list) -> None:
+        """
+        Batch probe engine over the slot arrays. Same contract as
+        HashMap._probe_group().
+        """
+        if self._lazy_clear:
+            self._refresh_path(hash)
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        m = self._capacity
+        i = hash & (m - 1) if self._pow2 else hash % m
+        step, increase = 1, self._step_increase
+        length = m
+        for j in range(1, m + 1):
+            state = states[i]
+            if state == _EMPTY:
+                length = j
                 break
+            if state == _LIVE:
+                positions = wanted.pop((hashes[i], keys[i]), None)
+                if positions is not None:
+                    for position in positions:
+                        found[position] = i
+                        if self._stats is not None:
+                            self._stats.record_probe(True, j)
+                    if not wanted:
+                        return
+            i = (i + step) % m
+            step += increase
+        if self._stats is not None:
+            for positions in wanted.values():
+                for _ in positions:
+                    self._stats.record_probe(False, length)
+
+    def _store(self, i: int, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that fills slot i, which is either empty or a
+        tombstone, with the key/value pair. Does not change the size.
+        """
+        if self._states[i] == _TOMBSTONE:
+            self._tombstones -= 1
+            if self._stats is not None:
+                self._stats.record_tombstone_reuse()
+        else:
+            self._empty_slots -= 1
+        self._states[i] = _LIVE
+        self._keys[i] = key
+        self._values[i] = value
+        self._hashes[i] = hash
+
+    def _kill(self, i: int) -> None:
+        """
+        Helper function that turns the live slot i into a tombstone. Does
+        not change the size.
+        """
+        self._states[i] = _TOMBSTONE
+        self._tombstones += 1
+
+    def _evict(self, i: int) -> tuple:
+        """
+        Helper function that returns the (key, value, hash) tuple of the
+        live slot i and turns it into a tombstone holding nothing, or
+        returns None if the slot is empty or a tombstone. Does not change
+        the size.
+        """
+        if self._states[i] != _LIVE:
+            return None
+        slot = self._keys[i], self._values[i], self._hashes[i]
+        self._states[i] = _TOMBSTONE
+        self._keys[i] = self._values[i] = self._hashes[i] = None
+        self._tombstones += 1
         return slot
 
+    def _value_at(self, i: int) -> object:
+        """Helper function that returns the value of the live slot i."""
+        return self._values[i]
+
+    def _set_value(self, i: int, value: object) -> None:
+        """Helper function that sets the value of the live slot i."""
+        self._values[i] = value
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that moves every live slot into new arrays of the
+        given (prime) capacity using the cached hashes. Same contract as
+        HashMap._rehash().
+        """
+        # Save the previous arrays and capacity.
+        start = time.perf_counter()
+        self._sweep()
+        prev_states, prev_keys = self._states, self._keys
+        prev_values, prev_hashes = self._values, self._hashes
+        prev_capacity = self._capacity
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._tombstones = 0
+
+        states, keys, values, hashes = self._states, self._keys, self._values, self._hashes
+        m = new_capacity
+        increase = self._step_increase
+        for k in range(len(prev_states)):
+            if prev_states[k] != _LIVE:
+                continue
+            hash = prev_hashes[k]
+            i = hash % m
+            step = 1
+            while states[i] != _EMPTY:
+                i = (i + step) % m
+                step += increase
+            states[i] = _LIVE
+            keys[i] = prev_keys[k]
+            values[i] = prev_values[k]
+            hashes[i] = hash
+        self._empty_slots = new_capacity - self._size
+
+        if self._stats is not None:
+            self._stats.record_resize(prev_capacity, new_capacity,
+                                      time.perf_counter() - start)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map. The results are unsorted.
+        """
+        self._sweep()
+        da = DynamicArray()
+        tables = (self,) if self._draining is None else (self, self._draining)
+        for table in tables:
+            states, keys, values = table._states, table._keys, table._values
+            for i in range(table._capacity):
+                if states[i] == _LIVE:
+                    da.append((keys[i], values[i]))
+        return da
+
+    def __next__(self):
+        """
+        Return a HashEntry snapshot of the next live slot in the hash map,
+        based on the current location of the iterator.
+        """
+        while self._index < self._capacity:
+            i = self._index
+            self._index += 1
+            if self._states[i] == _LIVE:
+                return HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+        # ...then the entries still waiting in the old table, if resizing.
+        if self._draining is None:
+            raise StopIteration
+        return next(self._draining)
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 
@@ -534,3 +1397,53 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nCustom - put_many example 1")
+    print("---------------------------")
+    m = HashMap(53, hash_function_1)
+    m.put_many(('str' + str(i), i * 100) for i in range(150))
+    print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    m = HashMap.from_pairs([('key1', 10), ('key2', 20), ('key1', 30)])
+    print(m.get_size(), m.get_capacity(), m.get('key1'), m.get('key2'))
+
+    print("\nCustom - tombstone_ratio example 1")
+    print("----------------------------------")
+    m = HashMap(53, hash_function_1)
+    for hour in range(4):
+        for i in range(20):
+            m.put('session' + str(hour) + '_' + str(i), i)
+        for i in range(20):
+            m.remove('session' + str(hour) + '_' + str(i))
+        print(m.get_size(), m.get_capacity(), round(m.tombstone_ratio(), 2))
+
+    print("\nCustom - SoAHashMap example 1")
+    print("-----------------------------")
+    m = SoAHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    m = SoAHashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+
+    print("\nCustom - stats example 1")
+    print("------------------------")
+    m = HashMap(53, hash_function_1)
+    m.enable_stats(lambda event, details:
+                   print(event, details['old_capacity'], details['new_capacity'])
+                   if event == 'resize' else None)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 3):
+        m.remove('str' + str(i))
+    for i in range(200):
+        m.get('str' + str(i))
+    stats = m.stats()
+    print(stats['size'], stats['capacity'], stats['resizes'], stats['tombstones'],
+          sum(stats['probe_hits'].values()), sum(stats['probe_misses'].values()))
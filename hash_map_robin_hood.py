@@ -0,0 +1,346 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Implements a hashmap using open addressing with Robin Hood
+#              linear probing. Each slot stores the probe distance of its
+#              entry from its home slot; inserts take the slot of any entry
+#              closer to home than themselves, removals shift the following
+#              entries back instead of leaving tombstones, and lookups stop
+#              as soon as they pass where the key would have been placed.
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from primes import is_prime, next_prime
+from hash_functions import finalized
+
+# Probe distance of an empty slot.
+_EMPTY = -1
+
+
+class HashMap:
+    """
+    Robin Hood open addressing HashMap with the same public API as the
+    quadratic probing HashMap of hash_map_oa. Keys, values, cached hashes
+    and probe distances are held in parallel flat lists.
+
+    Because removals leave no tombstones and misses stop early, the table
+    can run at a much higher load factor: it grows once the load factor
+    would exceed max_load (0.9 by default). The hash function is
+    finalized as in pow2 mode, since linear probing would otherwise turn
+    keys with close hashes into long runs.
+    """
+
+    def __init__(self, capacity: int, function, max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution
+
+        max_load must be between 0 and 1 (exclusive): the table needs an
+        empty slot, and a load factor of 0 can not be reached by growing.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError('max_load must be between 0 and 1, not ' + repr(max_load))
+
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._allocate(self._capacity)
+
+        # Probe runs are contiguous, so the hash is run through a finalizer
+        # to spread keys with close hashes over the table.
+        self._hash_function = finalized(function)
+        self._max_load = max_load
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap.
+        """
+        out = ''
+        for i in range(self._capacity):
+            slot = None
+            if self._distances[i] != _EMPTY:
+                slot = HashEntry(self._keys[i], self._values[i])
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper function that allocates empty slot arrays of the given capacity.
+        """
+        self._distances = [_EMPTY] * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [None] * capacity
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Helper function that returns the index of the slot holding the key
+        given its hash, or -1 if the key is not in the hash map. The search
+        stops at the first slot whose entry is closer to its home slot than
+        the key would be, since an insert of the key would have taken it.
+        """
+        distances = self._distances
+        m = self._capacity
+        i = hash % m
+        distance = 0
+        while True:
+            d = distances[i]
+            # ... an empty slot (-1) or a richer entry: the key is not here.
+            if d < distance:
+                return -1
+            if d == distance and self._hashes[i] == hash and self._keys[i] == key:
+                return i
+            i += 1
+            if i == m:
+                i = 0
+            distance += 1
+
+    def _insert(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that places a key that is not in the hash map.
+        Walks from the home slot of the key, and whenever it reaches an
+        entry closer to its own home slot, takes that slot and carries on
+        placing the displaced entry instead. Does not change the size.
+        """
+        distances, keys, values, hashes = self._distances, self._keys, self._values, self._hashes
+        m = self._capacity
+        i = hash % m
+        distance = 0
+        while True:
+            d = distances[i]
+            if d == _EMPTY:
+                distances[i], keys[i], values[i], hashes[i] = distance, key, value, hash
+                return
+            if d < distance:
+                # Rob the richer entry of its slot, and place it further on.
+                distances[i], distance = distance, d
+                keys[i], key = key, keys[i]
+                values[i], value = value, values[i]
+                hashes[i], hash = hash, hashes[i]
+            i += 1
+            if i == m:
+                i = 0
+            distance += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the given key
+        already exists in the hash map, its associated value is replaced
+        with the new value. If the given key is not in the hash map, a
+        new key/value pair is added.
+
+        The table is resized to double its current capacity (rounded up to
+        the next prime) when adding the pair would take
+        the load factor above max_load.
+        """
+        hash = self._hash_function(key)
+        i = self._find(key, hash)
+        if i != -1:
+            self._values[i] = value
+            return
+
+        if (self._size + 1) / self._capacity > self._max_load:
+            self._rehash(next_prime(2 * self._capacity))
+        self._insert(key, value, hash)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table. Without
+        tombstones, every slot not holding an entry is empty.
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. All existing
+        key/value pairs remain in the new hash map, and all hash table
+        links are rehashed.
+
+        The method does nothing if new_capacity less than the current
+        number of elements in the hash map. If new_capacity is valid,
+        checks if it is a prime number and makes it the next highest if not,
+        then keeps doubling it until the load factor is within max_load.
+        """
+        # Capacity must be larger than current number of elements.
+        if new_capacity < self._size:
+            return
+
+        # Capacity must be a prime number.
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+
+        while self._size / new_capacity > self._max_load:
+            new_capacity = next_prime(2 * new_capacity)
+
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that places every entry into new slot arrays of the
+        given (prime) capacity, using the cached hashes. The hash map size
+        does not change.
+        """
+        prev_distances, prev_keys = self._distances, self._keys
+        prev_values, prev_hashes = self._values, self._hashes
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        for k in range(len(prev_distances)):
+            if prev_distances[k] != _EMPTY:
+                self._insert(prev_keys[k], prev_values[k], prev_hashes[k])
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is
+        not in the hash map, the method returns None.
+        """
+        i = self._find(key, self._hash_function(key))
+        if i != -1:
+            return self._values[i]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it
+        returns False. An empty hash map does not contain any keys.
+        """
+        if self._size == 0:
+            return False
+        return self._find(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        If the key is not in the hash map, the method does nothing.
+
+        Instead of leaving a tombstone, the entries following the removed
+        one are shifted back a slot, up to the first empty slot or entry
+        already in its home slot.
+        """
+        i = self._find(key, self._hash_function(key))
+        if i == -1:
+            return
+
+        distances, keys, values, hashes = self._distances, self._keys, self._values, self._hashes
+        m = self._capacity
+        j = i + 1 if i + 1 < m else 0
+        while distances[j] > 0:
+            distances[i] = distances[j] - 1
+            keys[i], values[i], hashes[i] = keys[j], values[j], hashes[j]
+            i = j
+            j = i + 1 if i + 1 < m else 0
+        distances[i] = _EMPTY
+        keys[i] = values[i] = hashes[i] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the
+        underlying hash table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map. The results are unsorted.
+        """
+        da = DynamicArray()
+        for i in range(self._capacity):
+            if self._distances[i] != _EMPTY:
+                da.append((self._keys[i], self._values[i]))
+        return da
+
+    def __iter__(self):
+        """
+        Enables the hash map to iterate across itself. Builds the
+        iterator functionality inside the HashMap class.
+        """
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Return a HashEntry snapshot of the next entry in the hash map,
+        based on the current location of the iterator.
+        """
+        while True:
+            if self._index == self._capacity:
+                raise StopIteration
+            i = self._index
+            self._index += 1
+            if self._distances[i] != _EMPTY:
+                return HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nRobin Hood - put example 1")
+    print("--------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nRobin Hood - remove example 1")
+    print("-----------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.contains_key('str0'), m.get('str1'))
+
+    print("\nRobin Hood - resize example 1")
+    print("-----------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nRobin Hood - __iter__(), __next__() example 1")
+    print("---------------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
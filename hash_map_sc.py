@@ -7,29 +7,134 @@
 #               for collision resolution inside the dynamic array.
 
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+import copy
+import time
+
+from a6_include import (DynamicArray, LinkedList, SortedBucket,
+                        SlottedDynamicArray, SlottedLinkedList,
+                        SlottedSortedBucket, raw_buffer,
+                        hash_function_1, hash_function_2, batch_hash)
+from primes import is_prime, next_prime
+from map_stats import MapStats
+from hash_functions import finalized
 
 
 class HashMap:
+    # Number of buckets moved out of the table being drained on each
+    # operation while an incremental resize is in progress.
+    _MIGRATE_BUCKETS = 8
+
+    # Set to True (on the class or on an instance) to have empty_buckets()
+    # and longest_chain() cross-check the occupancy counters against a full
+    # scan of the table, raising AssertionError if they disagree.
+    verify_counters = False
+
+    # With the shrink policy on, the table shrinks once the load factor
+    # falls below this, well under the 1.0 that makes it grow.
+    _SHRINK_LOAD = 0.25
+
+    # With adaptive buckets on, a chain becomes a SortedBucket once it is
+    # longer than this, and a LinkedList again once shorter than the other.
+    _TREEIFY_LENGTH = 8
+    _UNTREEIFY_LENGTH = 6
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental: bool = False,
+                 lazy_clear: bool = False,
+                 shrink: bool = False,
+                 pow2: bool = False,
+                 treeify: bool = False,
+                 access_policy: str = None,
+                 slotted: bool = False) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        If incremental is True, automatic resizes move the links over to
+        the new table a few buckets at a time on each subsequent operation,
+        instead of all at once inside the put() that triggered them.
+
+        If lazy_clear is True, clear() runs in constant time: each bucket is
+        stamped with the generation it was written in, clear() starts a new
+        generation, and buckets from older generations are treated as empty
+        and reset when they are next reached.
+
+        If shrink is True, removals shrink the table once the load factor
+        falls below 0.25, down to no less than the initial capacity.
+
+        If pow2 is True, capacities are powers of two instead of primes, and
+        buckets are indexed by masking the low bits of the hash, which is
+        run through a finalizer so those bits are well mixed.
+
+        If treeify is True, buckets adapt to the length of their chain: a
+        chain longer than 8 links is kept in a SortedBucket, an array of its
+        nodes sorted by (hash, key) and searched by bisection, so lookups in
+        it take O(log k) comparisons; it goes back to a LinkedList once it
+        is shorter than 6 links.
+
+        If access_policy is 'move_to_front' or 'transpose', chains organize
+        themselves around the keys in use: the node found by get() or
+        contains_key() is moved to the front of its chain, or one link
+        closer to it, so frequently read keys are found after fewer
+        comparisons.
+
+        If slotted is True, the table and its chains are built from the
+        __slots__ versions of DynamicArray, LinkedList, SortedBucket and
+        SLNode, which have no per-instance __dict__ and take less memory
+        per key.
         """
-        self._buckets = DynamicArray()
+        # Storage types: the slotted versions, or the plain ones.
+        self._array_type = SlottedDynamicArray if slotted else DynamicArray
+        self._list_type = SlottedLinkedList if slotted else LinkedList
+        self._sorted_type = SlottedSortedBucket if slotted else SortedBucket
+
+        # Lazy clearing: the current generation, stamped on every bucket of
+        # the table (in self._stamps) when it is allocated or reset.
+        self._lazy_clear = lazy_clear
+        self._generation = 0
+
+        # Empty bucket shared by the buckets of a lazily allocated table.
+        self._empty_bucket = self._list_type()
+
+        # capacity must be a prime number (or a power of two in pow2 mode)
+        self._pow2 = pow2
+        self._capacity = self._next_capacity(capacity)
+        self._allocate(self._capacity)
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # Shrink policy, and the capacity it never shrinks below.
+        self._shrink = shrink
+        self._min_capacity = self._capacity
 
-        self._hash_function = function
+        self._hash_function = finalized(function) if pow2 else function
         self._size = 0
 
+        # Adaptive buckets: long chains are kept in a SortedBucket.
+        self._treeify = treeify
+
+        # Self-organizing chains: the LinkedList method that get() and
+        # contains_key() find keys with, or None to use contains().
+        if access_policy not in (None, 'move_to_front', 'transpose'):
+            raise ValueError('unknown access policy: ' + repr(access_policy))
+        self._access_policy = access_policy
+        self._access = getattr(LinkedList, access_policy) if access_policy else None
+
+        # Incremental resizing: the old table still being drained (a shallow
+        # copy of this map, or None), and the next bucket to move out of it.
+        self._incremental = incremental
+        self._draining = None
+        self._migrate_index = 0
+
+        # During an incremental resize, once a read asked for them: the
+        # length each chain of the current table will have once the old
+        # table is drained, and the number of chains of each such length.
+        self._projected = None
+        self._projected_counts = None
+
+        # Instrumentation counters (a MapStats), or None while disabled.
+        self._stats = None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -43,35 +148,34 @@ class HashMap:
     def _next_prime(self, capacity: int) -> int:
         """
         Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
+        return is_prime(capacity)
 
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+    def _next_capacity(self, capacity: int) -> int:
+        """
+        Helper function that returns the smallest valid capacity of at least
+        the given one: a power of two in pow2 mode, otherwise an odd prime.
+        """
+        if self._pow2:
+            return 1 << max(capacity - 1, 0).bit_length()
+        return self._next_prime(capacity)
 
-        return True
+    def _growth_capacity(self) -> int:
+        """
+        Helper function that returns the capacity to grow the table to:
+        double the current one in pow2 mode, otherwise the next prime of
+        double the current one.
+        """
+        if self._pow2:
+            return 2 * self._capacity
+        return self._next_prime(2 * self._capacity)
 
     def get_size(self) -> int:
         """
@@ -89,6 +193,111 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    def _allocate(self, capacity: int, lazy: bool = False) -> None:
+        """
+        Helper function that allocates a table of empty buckets of the given
+        capacity.
+
+        If lazy is True, every bucket is the shared self._empty_bucket, and
+        gets a LinkedList of its own when a link is first inserted in it, so
+        the table is allocated without building a LinkedList per bucket.
+        """
+        if lazy:
+            self._buckets = self._array_type([self._empty_bucket] * capacity)
+        else:
+            self._buckets = self._array_type([self._list_type() for _ in range(capacity)])
+
+        # Number of buckets holding a chain of each length, kept up to date
+        # on every insert and removal. The last entry is never zero, so the
+        # longest chain is len(self._chain_counts) - 1.
+        self._chain_counts = [capacity]
+        if self._lazy_clear:
+            self._stamps = [self._generation] * capacity
+
+    def _refresh(self, index: int) -> None:
+        """
+        Helper function for the lazy clear mode that empties the bucket at
+        the given index if it was last written before the last clear().
+        """
+        if self._stamps[index] != self._generation:
+            # A new LinkedList, as the bucket may be a SortedBucket.
+            self._buckets[index] = self._list_type()
+            self._stamps[index] = self._generation
+
+    def _sweep(self) -> None:
+        """
+        Helper function for the lazy clear mode that empties every bucket
+        left over from before the last clear(). Called before the operations
+        that walk the whole table.
+        """
+        if not self._lazy_clear:
+            return
+        for i in range(self._capacity):
+            self._refresh(i)
+
+    def _adapt(self, index: int) -> None:
+        """
+        Helper function for the adaptive buckets that switches the bucket
+        at the given index to a SortedBucket once its chain is longer than
+        _TREEIFY_LENGTH, and back to a LinkedList once it is shorter than
+        _UNTREEIFY_LENGTH. The gap keeps a chain that hovers around one
+        length from switching back and forth.
+        """
+        buckets = raw_buffer(self._buckets)
+        bucket = buckets[index]
+        if type(bucket) is self._list_type:
+            if bucket.length() > self._TREEIFY_LENGTH:
+                buckets[index] = self._sorted_type(bucket)
+        elif bucket.length() < self._UNTREEIFY_LENGTH:
+            chain = self._list_type()
+            for node in bucket:
+                chain.insert(node.key, node.value, node.hash)
+            buckets[index] = chain
+
+    def _chain_changed(self, old_length: int, new_length: int) -> None:
+        """
+        Helper function that updates the chain length counts after the
+        chain of one bucket went from old_length to new_length links.
+        """
+        self._shift_count(self._chain_counts, old_length, new_length)
+
+    @staticmethod
+    def _shift_count(counts: list, old_length: int, new_length: int) -> None:
+        """
+        Helper function that moves one chain from old_length to new_length
+        in the given chain length counts, whose last entry is kept non-zero.
+        """
+        counts[old_length] -= 1
+        if new_length == len(counts):
+            counts.append(0)
+        counts[new_length] += 1
+        while counts[-1] == 0:
+            counts.pop()
+
+    def _scan_chains(self) -> list:
+        """
+        Helper function that counts the buckets holding a chain of each
+        length with a full scan of the table.
+        """
+        counts = [0]
+        for bucket in raw_buffer(self._buckets):
+            length = bucket.length()
+            while length >= len(counts):
+                counts.append(0)
+            counts[length] += 1
+        return counts
+
+    def _verify_counters(self) -> None:
+        """
+        Helper function that raises AssertionError if the chain length
+        counts do not match a full scan of the table.
+        """
+        self._sweep()
+        scanned = self._scan_chains()
+        if scanned != self._chain_counts:
+            raise AssertionError('chain length counts ' + str(self._chain_counts) +
+                                 ' do not match the table ' + str(scanned))
+
     def put(self, key: str, value: object) -> None:
         """
         Updates the key/value pair in the hash map. If the given key
@@ -96,42 +305,186 @@ class HashMap:
         with the new value. If the given key is not in the hash map, a
         new key/value pair is added.
 
-        The table is resized to double its current capacity when this
-        method is called and the current load factor of the table is >= 1.0.
+        The table is resized to double its current capacity (rounded up to
+        the next prime) when this method is called and the current load
+        factor of the table is >= 1.0.
         """
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
+
         # ~Doubles the array capacity if the load factor exceeds unity.
-        # Note: .resize_table() guarantees the capacity will be a prime number.
         if self.table_load() >= 1.0:
-            self.resize_table(2 * self._capacity)
+            self._resize(self._growth_capacity())
 
+        hash = self._hash_function(key)
+        size = self._size
+        self._put(key, value, hash)
+        if self._projected is not None and self._size != size:
+            self._project(hash, 1)
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that updates or inserts the key/value pair given the
+        hash of the key. Does not check the load factor.
+        """
         # Now we need to update the key/value pair.
         # First get the bucket/link-list.
-        index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[index]
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        bucket = raw_buffer(self._buckets)[index]
 
-        # Check if the linked-list contains our key.
+        # Check if the linked-list contains our key, or if the key is still
+        # waiting in the old table while it is being drained.
         # Note: .contains() will return either None, or the node of the key.
-        node = bucket.contains(key)
+        node = bucket.contains(key, hash)
+        if node is None and self._draining is not None:
+            node = self._draining._locate(key, hash)
 
         # If node is None, we didn't find our key, so insert a new node and
         # update hash map size.
         if node is None:
-            bucket.insert(key, value)
+            if bucket is self._empty_bucket:
+                bucket = raw_buffer(self._buckets)[index] = self._list_type()
+            length = bucket.length()
+            bucket.insert(key, value, hash)
+            self._chain_changed(length, length + 1)
             self._size += 1
+            if self._treeify:
+                self._adapt(index)
         # Otherwise, we found our key, so update the node value.
         else:
             node.value = value
 
+    def _find(self, key: str, hash: int):
+        """
+        Helper function that returns the node of the key given its hash, or
+        None if the key is not in the hash map.
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        bucket = raw_buffer(self._buckets)[index]
+        if self._stats is not None:
+            # The same lookup, also counting the nodes it compares.
+            node, compared = bucket.probe(key, hash, self._access_policy)
+            self._stats.record_probe(node is not None, compared)
+        elif self._access is not None and type(bucket) is self._list_type:
+            node = self._access(bucket, key, hash)
+        else:
+            node = bucket.contains(key, hash)
+
+        # Check the old table too while it is being drained.
+        if node is None and self._draining is not None:
+            node = self._draining._find(key, hash)
+        return node
+
+    def _locate(self, key: str, hash: int):
+        """
+        Helper function that returns the node of the key given its hash, or
+        None if the key is not in the hash map, like _find() but without
+        recording a probe or reorganizing the chain. Used by put().
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        node = raw_buffer(self._buckets)[index].contains(key, hash)
+        if node is None and self._draining is not None:
+            node = self._draining._locate(key, hash)
+        return node
+
     def empty_buckets(self) -> int:
         """
         Returns the number of empty buckets in the hash table.
+
+        During an incremental resize, the count is that of the table once
+        the old one is drained. The first read of a resize takes a pass over
+        both tables to project the waiting links (see _final_counts()).
         """
-        # Sums the empty buckets of the hashmap.
-        counts = 0
-        for i in range(self._capacity):
-            if self._buckets[i].length() == 0:
-                counts += 1
-        return counts
+        if self.verify_counters:
+            self._verify_counters()
+        return self._final_counts()[0]
+
+    def longest_chain(self) -> int:
+        """
+        Returns the number of links in the longest chain of the hash table.
+
+        During an incremental resize, the length is that in the table once
+        the old one is drained, as for empty_buckets().
+        """
+        if self.verify_counters:
+            self._verify_counters()
+        return len(self._final_counts()) - 1
+
+    def _final_counts(self) -> list:
+        """
+        Helper function that returns the chain length counts of the table,
+        or during an incremental resize, of the table as it will be once
+        the links still waiting in the old one have moved over.
+
+        The first call of a resize projects the waiting links onto the
+        current table, in one pass over both tables. put() and remove()
+        then keep the projection up to date (see _project()), and moving
+        links over does not change it, so later calls take O(1) time.
+        """
+        if self._draining is None:
+            return self._chain_counts
+        if self._projected is None:
+            lengths = [self._length_at(i) for i in range(self._capacity)]
+            for index, count in self._pending_links().items():
+                lengths[index] += count
+            counts = [0] * (max(lengths) + 1)
+            for length in lengths:
+                counts[length] += 1
+            self._projected, self._projected_counts = lengths, counts
+        return self._projected_counts
+
+    def _project(self, hash: int, change: int) -> None:
+        """
+        Helper function that updates the projected chain lengths after a
+        key of the given hash was added to (change of 1) or removed from
+        (change of -1) either table during an incremental resize.
+        """
+        index = hash % self._capacity
+        length = self._projected[index]
+        self._projected[index] = length + change
+        self._shift_count(self._projected_counts, length, length + change)
+
+    def _length_at(self, index: int) -> int:
+        """
+        Helper function that returns the length of the chain of the bucket
+        at the given index.
+        """
+        return raw_buffer(self._buckets)[index].length()
+
+    def _raw_buckets(self) -> list:
+        """
+        Helper function that returns the list behind the table of buckets.
+        """
+        return raw_buffer(self._buckets)
+
+    def _hashes_at(self, index: int) -> list:
+        """
+        Helper function that returns the cached hashes of the links of the
+        bucket at the given index.
+        """
+        return [node.hash for node in raw_buffer(self._buckets)[index]]
+
+    def _pending_links(self) -> dict:
+        """
+        Helper function for the read-only methods during an incremental
+        resize. Returns, for each bucket of the current table that links
+        still waiting in the old table will go to, the number of those
+        links, without moving them.
+        """
+        old = self._draining
+        capacity = self._capacity
+        pending = {}
+        for i in range(self._migrate_index, old._capacity):
+            for hash in old._hashes_at(i):
+                index = hash % capacity
+                pending[index] = pending.get(index, 0) + 1
+        return pending
 
     def table_load(self) -> float:
         """
@@ -140,14 +493,67 @@ class HashMap:
         # Load factor = elements/buckets = size/capacity.
         return self._size/self._capacity
 
+    def enable_stats(self, hook=None, long_probe: int = 16) -> None:
+        """
+        Starts recording resizes, and the number of nodes compared by each
+        lookup of get() and contains_key(), with fresh counters. If a hook
+        is given, it is called as hook(event, details) after each resize and
+        each lookup comparing long_probe or more nodes. See MapStats.
+        """
+        self._stats = MapStats(hook, long_probe)
+        if self._draining is not None:
+            self._draining._stats = self._stats
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording and drops the counters.
+        """
+        self._stats = None
+        if self._draining is not None:
+            self._draining._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the hash table occupancy, including the chain
+        length distribution (chain length -> number of buckets) of the
+        current table, and, if enabled, of the recorded counters (which are
+        zero otherwise).
+        """
+        chain_lengths = {length: count for length, count in enumerate(self._chain_counts)
+                         if count}
+
+        counters = (self._stats or MapStats()).snapshot()
+        return {
+            'enabled': self._stats is not None,
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'chain_lengths': chain_lengths,
+            'resizing': self._draining is not None,
+            'probe_hits': counters['probe_hits'],
+            'probe_misses': counters['probe_misses'],
+            'resizes': counters['resizes'],
+            'resize_seconds': counters['resize_seconds'],
+        }
+
     def clear(self) -> None:
         """
         Clears the contents of the hash map. Does not change the underlying
         hash table capacity.
         """
-        # Clears the hashmap buckets.
-        for i in range(self._capacity):
-            self._buckets[i].__init__()
+        # Clears the hashmap buckets, dropping any old table being drained.
+        # In lazy clear mode, start a new generation instead; the old
+        # buckets are emptied as they are reached.
+        self._draining = None
+        self._projected = self._projected_counts = None
+        if self._lazy_clear:
+            self._generation += 1
+        else:
+            # New LinkedLists, as some buckets may be SortedBuckets.
+            buckets = raw_buffer(self._buckets)
+            for i in range(self._capacity):
+                buckets[i] = self._list_type()
+        self._chain_counts = [self._capacity]
 
         # Resets the hashmap size.
         self._size = 0
@@ -160,42 +566,156 @@ class HashMap:
 
         Checks that new_capacity is not less than 1; if so, the method
         does nothing. If new_capacity is 1 or more, checks if prime number.
-        If not, changes it to the next highest prime number.
+        If not, changes it to the next highest prime number. Explicit
+        resizes always take place at once, even in incremental mode.
         """
         # Capacity must be at least 1.
         if new_capacity < 1:
             return
 
-        # Capacity must be a prime number.
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Capacity must be a prime number (or a power of two in pow2 mode).
+        if self._pow2 or not self._is_prime(new_capacity):
+            new_capacity = self._next_capacity(new_capacity)
 
-        # DYNAMIC ARRAY IMPLEMENTATION 1 (Passes Gradescope)
-        # Save previous buckets.
-        prev_buckets = self._buckets
+        # Keep doubling the target until the rehashed table respects the
+        # max load factor, so no resize is needed part way through.
+        while (self._size - 1) / new_capacity >= 1.0:
+            new_capacity = self._next_capacity(2 * new_capacity)
+
+        self._finish_resize()
+        self._rehash(new_capacity)
 
-        # Re-init buckets with new capacity, and reset size.
-        self._buckets = DynamicArray()
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Helper function for the automatic resizes, which moves every
+        key/value pair into a table of the given (prime) capacity. In
+        incremental mode, this only sets up the new table, and the links are
+        moved over by _migrate() on the following operations.
+        """
+        # Only one incremental resize can be in progress at a time, and the
+        # table being drained must not hold buckets from before a clear().
+        self._finish_resize()
+        self._sweep()
+
+        if not self._incremental:
+            self._rehash(new_capacity)
+            return
+
+        # The old table lives on in a shallow copy of this map, which keeps
+        # the current buckets while this map switches to the new table. The
+        # new table is allocated lazily, so this put() does not build it.
+        start = time.perf_counter()
+        self._draining = copy.copy(self)
+        self._allocate(new_capacity, lazy=True)
         self._capacity = new_capacity
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
-        self._size = 0
+        self._migrate_index = 0
+        if self._stats is not None:
+            self._stats.record_resize(self._draining._capacity, new_capacity,
+                                      time.perf_counter() - start)
 
-        # Rehash previous key/value pairs from old buckets into new.
-        for i in range(prev_buckets.length()):
-            linked_list = prev_buckets[i]
-            for node in linked_list:
-                self.put(node.key, node.value)
+    def _shrink_if_sparse(self) -> None:
+        """
+        Helper function for the shrink policy. Once the load factor falls
+        below 0.25, resizes the table to the next prime of twice the
+        size (but no less than the initial capacity), which puts the load
+        factor back halfway to the growth threshold of 1.0. The gap between
+        the two keeps a map that hovers around one size from resizing back
+        and forth.
+        """
+        if self.table_load() >= self._SHRINK_LOAD:
+            return
+        new_capacity = self._next_capacity(max(2 * self._size, self._min_capacity))
+        if new_capacity < self._capacity:
+            self._resize(new_capacity)
+
+    def _migrate(self, count: int) -> None:
+        """
+        Helper function that moves the links of the next count buckets of
+        the table being drained into the current table, by their cached
+        hashes, and empties those buckets. The emptied buckets are replaced
+        by the shared empty bucket, so they are freed as the migration goes
+        rather than all at once with the old table.
+        """
+        stats = self._stats
+        clock = time.perf_counter() if stats is not None else 0.0
+        old = self._draining
+        start = self._migrate_index
+        end = min(start + count, old._capacity)
+        old_buckets = raw_buffer(old._buckets)
+        buckets = raw_buffer(self._buckets)
+        capacity = self._capacity
+        for i in range(start, end):
+            bucket = old_buckets[i]
+            for node in bucket:
+                index = node.hash % capacity
+                target = buckets[index]
+                if target is self._empty_bucket:
+                    target = buckets[index] = self._list_type()
+                length = target.length()
+                target.insert(node.key, node.value, node.hash)
+                self._chain_changed(length, length + 1)
+                if self._treeify:
+                    self._adapt(index)
+            old._chain_changed(bucket.length(), 0)
+            old_buckets[i] = self._empty_bucket
+        self._migrate_index = end
+        if stats is not None:
+            stats.record_migration(time.perf_counter() - clock)
+
+        # The old table is empty once every bucket has been visited.
+        if end == old._capacity:
+            self._draining = None
+            self._projected = self._projected_counts = None
+
+    def _finish_resize(self) -> None:
+        """
+        Helper function that completes an incremental resize in progress.
+        """
+        if self._draining is not None:
+            self._migrate(self._draining._capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that moves every key/value pair into a new table of
+        the given (prime) capacity. Links are placed by the hash cached on
+        each node, so no key is hashed again and the load factor is not
+        re-checked. The hash map size does not change.
+        """
+        # Save previous buckets and capacity.
+        start = time.perf_counter()
+        self._sweep()
+        prev_buckets = raw_buffer(self._buckets)
+        prev_capacity = self._capacity
+
+        # Re-init buckets with new capacity.
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        # Place previous key/value pairs from old buckets into new.
+        # Note: for a power-of-two capacity, % is the same as masking.
+        buckets = raw_buffer(self._buckets)
+        for bucket in prev_buckets:
+            for node in bucket:
+                buckets[node.hash % new_capacity].insert(node.key, node.value, node.hash)
+        self._chain_counts = self._scan_chains()
+        if self._treeify:
+            for i in range(new_capacity):
+                self._adapt(i)
+
+        if self._stats is not None:
+            self._stats.record_resize(prev_capacity, new_capacity,
+                                      time.perf_counter() - start)
 
     def get(self, key: str):
         """
         Returns the value associated with the given key. If the key is
         not in the hash map, the method returns None.
         """
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
+
         # Check the bucket/link if it contains are key.
-        index = self._hash_function(key) % self._capacity
-        bucket = self._buckets[index]
-        node = bucket.contains(key)
+        node = self._find(key, self._hash_function(key))
 
         # Only return a value if we get back a node.
         if node is not None:
@@ -207,25 +727,58 @@ class HashMap:
         returns False. An empty hash map does not contain any keys.
         """
         # Returns true unless the hashmap is empty or the key doesn't exist.
-        if (self._size == 0) or (self.get(key) is None):
+        # Note: checks for the node rather than the value, since a key can be
+        # stored with a value of None.
+        if self._size == 0:
             return False
-        return True
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
+
+        return self._find(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
         Removes the given key and its associated value from the hash map.
         If the key is not in the hash map, the method does nothing.
         """
-        # Gets the bucket/linked-list.
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
 
-        # Remove the node from the bucket/linked-list, if present.
-        status = linked_list.remove(key)
+        hash = self._hash_function(key)
+        if not self._remove(key, hash):
+            return
+        if self._projected is not None:
+            self._project(hash, -1)
+        if self._shrink:
+            self._shrink_if_sparse()
+
+    def _remove(self, key: str, hash: int) -> bool:
+        """
+        Helper function that removes the key given its hash, if present.
+        Returns True if the key was removed, otherwise False.
+        """
+        # Gets the bucket/linked-list.
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        linked_list = raw_buffer(self._buckets)[index]
+
+        # Remove the node from the bucket/linked-list, if present, or else
+        # from the old table while it is being drained.
+        status = linked_list.remove(key, hash)
+        if status is True:
+            length = linked_list.length()
+            self._chain_changed(length + 1, length)
+            if self._treeify:
+                self._adapt(index)
+        elif self._draining is not None:
+            status = self._draining._remove(key, hash)
 
         # If the remove is successful, decrement the hashmap size.
         if status is True:
             self._size -= 1
+        return status
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -234,14 +787,581 @@ class HashMap:
 
         The order of the keys in the dynamic array does not matter.
         """
+        self._sweep()
+
         # Loop over the hashmap buckets/linked-lists and nodes, appending
-        # key/value pairs as tuples to the output array.
+        # key/value pairs as tuples to the output array, then over those of
+        # the old table while it is being drained.
         da = DynamicArray()
+        for table in self._tables():
+            for bucket in raw_buffer(table._buckets):
+                for node in bucket:
+                    da.append((node.key, node.value))
+        return da
+
+    def _tables(self) -> tuple:
+        """
+        Helper function that returns this map, followed by the old table
+        being drained during an incremental resize.
+        """
+        if self._draining is None:
+            return (self,)
+        return self, self._draining
+
+    def put_many(self, pairs) -> None:
+        """
+        Updates the hash map with every key/value pair of the given iterable,
+        as if put() was called on each pair in order.
+
+        The table is resized once, up front, to the smallest prime capacity
+        that holds every pair below the max load factor of 1.0, so there is
+        no resizing while the pairs are inserted.
+        """
+        pairs = list(pairs)
+        self._finish_resize()
+
+        # Size for the worst case where every key is new.
+        count = self._size + len(pairs)
+        if count > self._capacity:
+            self.resize_table(count)
+
+        # Hash the whole batch of keys in one call.
+        hashes = batch_hash(self._hash_function, [key for key, _ in pairs])
+        for (key, value), hash in zip(pairs, hashes):
+            self._put(key, value, hash)
+
+    @classmethod
+    def from_pairs(cls, pairs, function: callable = hash_function_1) -> "HashMap":
+        """
+        Builds a new hash map from an iterable of key/value pairs. The table
+        is sized once for all of the pairs.
+        """
+        hash_map = cls(1, function)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def _group_by_bucket(self, hashes: list) -> list:
+        """
+        Helper function that returns a list of (index, bucket, positions)
+        tuples, grouping the positions in the given list of hashes by the
+        bucket they hash to.
+        """
+        # Note: for a power-of-two capacity, % is the same as masking.
+        capacity = self._capacity
+        groups = {}
+        for position, hash in enumerate(hashes):
+            groups.setdefault(hash % capacity, []).append(position)
+        if self._lazy_clear:
+            for index in groups:
+                self._refresh(index)
+        buckets = self._raw_buckets()
+        return [(index, buckets[index], positions) for index, positions in groups.items()]
+
+    def _find_in(self, bucket, key: str, hash: int):
+        """
+        Helper function for the batch methods that returns the node of the
+        key given its hash and its bucket of the current table, or None if
+        the key is not in the hash map. Records the probe like _find(), but
+        leaves the chain in its order.
+        """
+        if self._stats is not None:
+            node, compared = bucket.probe(key, hash)
+            self._stats.record_probe(node is not None, compared)
+        else:
+            node = bucket.contains(key, hash)
+        if node is None and self._draining is not None:
+            node = self._draining._find(key, hash)
+        return node
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys,
+        in order, or None for the keys not in the hash map. The keys are
+        hashed in one batch and looked up bucket by bucket.
+        """
+        keys = list(keys)
+        values = [None] * len(keys)
+        if self._size == 0:
+            return values
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for _, bucket, positions in self._group_by_bucket(hashes):
+            for position in positions:
+                node = self._find_in(bucket, keys[position], hashes[position])
+                if node is not None:
+                    values[position] = node.value
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        Returns a list with, for each of the given keys in order, True if the
+        key is in the hash map and False otherwise. The keys are hashed in
+        one batch and looked up bucket by bucket.
+        """
+        keys = list(keys)
+        found = [False] * len(keys)
+        if self._size == 0:
+            return found
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for _, bucket, positions in self._group_by_bucket(hashes):
+            for position in positions:
+                node = self._find_in(bucket, keys[position], hashes[position])
+                found[position] = node is not None
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the
+        hash map, skipping keys that are not in the hash map. The keys are
+        hashed in one batch and removed bucket by bucket.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for index, bucket, positions in self._group_by_bucket(hashes):
+            for position in positions:
+                key, hash = keys[position], hashes[position]
+                if bucket.remove(key, hash):
+                    length = bucket.length()
+                    self._chain_changed(length + 1, length)
+                elif self._draining is None or not self._draining._remove(key, hash):
+                    continue
+                self._size -= 1
+                if self._projected is not None:
+                    self._project(hash, -1)
+            if self._treeify:
+                self._adapt(index)
+
+        if self._shrink:
+            self._shrink_if_sparse()
+
+
+class CompactHashMap(HashMap):
+    """
+    Separate chaining HashMap with compact array buckets. Instead of a
+    LinkedList of SLNode objects, each bucket is a single flat list of
+    (hash, key, value) triples laid out one after the other, created on
+    the first insert into the bucket. An empty bucket is just None in the
+    table, and a bucket is set back to None once its last pair is removed.
+
+    This drops the per-pair node object and the per-bucket LinkedList, and
+    resizing moves single-pair buckets over as they are, without building
+    new ones. Has the same public API and resizing behaviour as HashMap
+    (including the incremental, lazy_clear, shrink and pow2 modes), so it
+    can be used as a drop-in replacement; the treeify and access_policy
+    options are not supported.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 incremental: bool = False,
+                 lazy_clear: bool = False,
+                 shrink: bool = False,
+                 pow2: bool = False) -> None:
+        """
+        Initialize new HashMap that uses separate chaining with compact
+        array buckets for collision resolution
+        """
+        super().__init__(capacity, function, incremental, lazy_clear, shrink, pow2)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide output in the same format as
+        HashMap.
+        """
+        out = ''
         for i in range(self._capacity):
-            for node in self._buckets[i]:
-                da.append((node.key, node.value))
+            bucket = self._buckets[i]
+            pairs = []
+            if bucket is not None:
+                for j in range(0, len(bucket), 3):
+                    pairs.append('(' + str(bucket[j + 1]) + ': ' + str(bucket[j + 2]) + ')')
+            out += str(i) + ': SLL [' + ' -> '.join(pairs) + ']\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int, lazy: bool = False) -> None:
+        """
+        Helper function that allocates a table of empty buckets of the given
+        capacity. Empty buckets are None, so every table is allocated
+        lazily.
+        """
+        self._buckets = [None] * capacity
+        self._chain_counts = [capacity]
+        if self._lazy_clear:
+            self._stamps = [self._generation] * capacity
+
+    def _refresh(self, index: int) -> None:
+        """
+        Helper function for the lazy clear mode that empties the bucket at
+        the given index if it was last written before the last clear().
+        """
+        if self._stamps[index] != self._generation:
+            self._buckets[index] = None
+            self._stamps[index] = self._generation
+
+    def _raw_buckets(self) -> list:
+        """
+        Helper function that returns the table of buckets, which is a plain
+        list already.
+        """
+        return self._buckets
+
+    def _scan_chains(self) -> list:
+        """
+        Helper function that counts the buckets holding a chain of each
+        length with a full scan of the table.
+        """
+        counts = [0]
+        for bucket in self._buckets:
+            length = len(bucket) // 3 if bucket is not None else 0
+            while length >= len(counts):
+                counts.append(0)
+            counts[length] += 1
+        return counts
+
+    def _length_at(self, index: int) -> int:
+        """
+        Helper function that returns the number of pairs in the bucket at
+        the given index.
+        """
+        bucket = self._buckets[index]
+        return 0 if bucket is None else len(bucket) // 3
+
+    def _hashes_at(self, index: int) -> list:
+        """
+        Helper function that returns the cached hashes of the pairs in the
+        bucket at the given index.
+        """
+        bucket = self._buckets[index]
+        return [] if bucket is None else bucket[::3]
+
+    @staticmethod
+    def _position(bucket: list, key: str, hash: int) -> int:
+        """
+        Helper function that returns the position of the triple of the key
+        in the bucket given its hash, or -1 if the key is not in it. Only
+        the keys of triples with a matching hash are compared.
+        """
+        for j in range(0, len(bucket), 3):
+            if bucket[j] == hash and bucket[j + 1] == key:
+                return j
+        return -1
+
+    def _insert(self, index: int, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that appends the key/value pair to the bucket at
+        the given index, creating the bucket if it is empty. Keeps the chain
+        length counts up to date, but does not change the size.
+        """
+        bucket = self._buckets[index]
+        if bucket is None:
+            self._buckets[index] = [hash, key, value]
+            self._chain_changed(0, 1)
+        else:
+            length = len(bucket) // 3
+            bucket += (hash, key, value)
+            self._chain_changed(length, length + 1)
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that updates or inserts the key/value pair given the
+        hash of the key. Does not check the load factor.
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        bucket = self._buckets[index]
+        j = -1 if bucket is None else self._position(bucket, key, hash)
+
+        # The key may still be waiting in the old table while it is drained.
+        if j == -1 and self._draining is not None:
+            bucket, j = self._draining._locate(key, hash)
+
+        if j == -1:
+            self._insert(index, key, value, hash)
+            self._size += 1
+        else:
+            bucket[j + 2] = value
+
+    def _find(self, key: str, hash: int) -> (list, int):
+        """
+        Helper function that returns the bucket holding the key and the
+        position of its triple in it, given its hash, or (None, -1) if the
+        key is not in the hash map.
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        return self._find_in(self._buckets[index], key, hash)
+
+    def _find_in(self, bucket: list, key: str, hash: int) -> (list, int):
+        """
+        Helper function that returns the bucket holding the key and the
+        position of its triple in it, given its hash and its bucket of the
+        current table (None if empty), or (None, -1) if the key is not in
+        the hash map.
+        """
+        j = -1 if bucket is None else self._position(bucket, key, hash)
+        if self._stats is not None:
+            length = 0 if bucket is None else len(bucket) // 3
+            self._stats.record_probe(j != -1, j // 3 + 1 if j != -1 else length)
+
+        # Check the old table too while it is being drained.
+        if j == -1:
+            if self._draining is not None:
+                return self._draining._find(key, hash)
+            return None, -1
+        return bucket, j
+
+    def _locate(self, key: str, hash: int) -> (list, int):
+        """
+        Helper function that returns the bucket holding the key and the
+        position of its triple in it, like _find() but without recording a
+        probe. Used by put().
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        bucket = self._buckets[index]
+        j = -1 if bucket is None else self._position(bucket, key, hash)
+        if j == -1:
+            if self._draining is not None:
+                return self._draining._locate(key, hash)
+            return None, -1
+        return bucket, j
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. Does not change the underlying
+        hash table capacity.
+        """
+        self._draining = None
+        self._projected = self._projected_counts = None
+        if self._lazy_clear:
+            self._generation += 1
+        else:
+            self._buckets = [None] * self._capacity
+        self._chain_counts = [self._capacity]
+        self._size = 0
+
+    def _migrate(self, count: int) -> None:
+        """
+        Helper function that moves the pairs of the next count buckets of
+        the table being drained into the current table, by their cached
+        hashes, and empties those buckets.
+        """
+        stats = self._stats
+        clock = time.perf_counter() if stats is not None else 0.0
+        old = self._draining
+        start = self._migrate_index
+        end = min(start + count, old._capacity)
+        capacity = self._capacity
+        for i in range(start, end):
+            bucket = old._buckets[i]
+            if bucket is None:
+                continue
+            for j in range(0, len(bucket), 3):
+                self._insert(bucket[j] % capacity, bucket[j + 1], bucket[j + 2], bucket[j])
+            old._chain_changed(len(bucket) // 3, 0)
+            old._buckets[i] = None
+        self._migrate_index = end
+        if stats is not None:
+            stats.record_migration(time.perf_counter() - clock)
+
+        # The old table is empty once every bucket has been visited.
+        if end == old._capacity:
+            self._draining = None
+            self._projected = self._projected_counts = None
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that moves every key/value pair into a new table of
+        the given (prime) capacity, by the hash cached in each triple. A
+        bucket holding a single pair is moved over as it is, and the others
+        are split into the new buckets. The hash map size does not change.
+        """
+        start = time.perf_counter()
+        self._sweep()
+        prev_buckets = self._buckets
+        prev_capacity = self._capacity
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        # Note: for a power-of-two capacity, % is the same as masking.
+        buckets = self._buckets
+        for bucket in prev_buckets:
+            if bucket is None:
+                continue
+            if len(bucket) == 3:
+                index = bucket[0] % new_capacity
+                target = buckets[index]
+                if target is None:
+                    buckets[index] = bucket
+                else:
+                    target += bucket
+                continue
+            for j in range(0, len(bucket), 3):
+                index = bucket[j] % new_capacity
+                target = buckets[index]
+                if target is None:
+                    buckets[index] = bucket[j:j + 3]
+                else:
+                    target += bucket[j:j + 3]
+        self._chain_counts = self._scan_chains()
+
+        if self._stats is not None:
+            self._stats.record_resize(prev_capacity, new_capacity,
+                                      time.perf_counter() - start)
+
+    def get(self, key: str):
+        """
+        Returns the value associated with the given key. If the key is
+        not in the hash map, the method returns None.
+        """
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
+
+        bucket, j = self._find(key, self._hash_function(key))
+        if j != -1:
+            return bucket[j + 2]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it
+        returns False. An empty hash map does not contain any keys.
+        """
+        if self._size == 0:
+            return False
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS)
+
+        return self._find(key, self._hash_function(key))[1] != -1
+
+    def _remove(self, key: str, hash: int) -> bool:
+        """
+        Helper function that removes the key given its hash, if present.
+        Returns True if the key was removed, otherwise False.
+        """
+        index = hash & (self._capacity - 1) if self._pow2 else hash % self._capacity
+        if self._lazy_clear:
+            self._refresh(index)
+        bucket = self._buckets[index]
+        j = -1 if bucket is None else self._position(bucket, key, hash)
+        if j == -1:
+            # Not in this table, but maybe in the old one being drained.
+            if self._draining is not None and self._draining._remove(key, hash):
+                self._size -= 1
+                return True
+            return False
+
+        # Fill the gap with the last triple; the order does not matter.
+        length = len(bucket) // 3
+        if length == 1:
+            self._buckets[index] = None
+        else:
+            bucket[j:j + 3] = bucket[-3:]
+            del bucket[-3:]
+        self._chain_changed(length, length - 1)
+        self._size -= 1
+        return True
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map.
+
+        The order of the keys in the dynamic array does not matter.
+        """
+        self._sweep()
+        da = DynamicArray()
+        for table in self._tables():
+            for bucket in table._buckets:
+                if bucket is not None:
+                    for j in range(0, len(bucket), 3):
+                        da.append((bucket[j + 1], bucket[j + 2]))
         return da
 
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys,
+        in order, or None for the keys not in the hash map. The keys are
+        hashed in one batch and looked up bucket by bucket.
+        """
+        keys = list(keys)
+        values = [None] * len(keys)
+        if self._size == 0:
+            return values
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for _, bucket, positions in self._group_by_bucket(hashes):
+            for position in positions:
+                holder, j = self._find_in(bucket, keys[position], hashes[position])
+                if j != -1:
+                    values[position] = holder[j + 2]
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        Returns a list with, for each of the given keys in order, True if the
+        key is in the hash map and False otherwise. The keys are hashed in
+        one batch and looked up bucket by bucket.
+        """
+        keys = list(keys)
+        found = [False] * len(keys)
+        if self._size == 0:
+            return found
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for _, bucket, positions in self._group_by_bucket(hashes):
+            for position in positions:
+                _, j = self._find_in(bucket, keys[position], hashes[position])
+                found[position] = j != -1
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the
+        hash map, skipping keys that are not in the hash map. The keys are
+        hashed in one batch.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return
+
+        if self._draining is not None:
+            self._migrate(self._MIGRATE_BUCKETS * len(keys))
+
+        hashes = batch_hash(self._hash_function, keys)
+        for key, hash in zip(keys, hashes):
+            if self._remove(key, hash) and self._projected is not None:
+                self._project(hash, -1)
+
+        if self._shrink:
+            self._shrink_if_sparse()
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -493,6 +1613,42 @@ if __name__ == "__main__":
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
 
+    print("\nCustom - put_many example 1")
+    print("---------------------------")
+    m = HashMap(53, hash_function_1)
+    m.put_many(('str' + str(i), i * 100) for i in range(150))
+    print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    m = HashMap.from_pairs([('key1', 10), ('key2', 20), ('key1', 30)])
+    print(m.get_size(), m.get_capacity(), m.get('key1'), m.get('key2'))
+
+    print("\nCustom - treeify example 1")
+    print("-------------------------")
+    # Anagrams all share one hash_function_1 bucket.
+    m = HashMap(11, hash_function_1, treeify=True)
+    keys = ['abcde', 'edcba', 'badce', 'cabed', 'decab', 'aebdc', 'bdeca', 'ceabd',
+            'dbace', 'eacdb', 'abdec', 'cdeab']
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    index = hash_function_1('abcde') % m.get_capacity()
+    print(m.longest_chain(), type(m._buckets[index]).__name__, m.get('decab'))
+    for key in keys[:7]:
+        m.remove(key)
+    print(m.longest_chain(), type(m._buckets[index]).__name__, m.get('cdeab'))
+
+    print("\nCustom - CompactHashMap example 1")
+    print("---------------------------------")
+    m = CompactHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    m = CompactHashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.remove('3')
+    print(m.get_size(), m.get('2'), m.contains_key('3'))
+    print(m)
+
 
 # ------------------------------------------------------------------------------------------
 
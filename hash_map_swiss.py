@@ -0,0 +1,500 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Implements a hashmap using open addressing modeled on Google's
+#              SwissTable. A compact array of control bytes, holding a 7-bit
+#              tag of the hash of each full slot, is kept apart from the keys
+#              and values. Probing scans groups of 16 control bytes at a time
+#              and only compares the full keys of the slots whose tag matches;
+#              the batch lookups scan the groups of all their keys with NumPy.
+
+try:
+    import numpy as np
+except ImportError:     # batch lookups fall back to the scalar probe
+    np = None
+
+from a6_include import (DynamicArray, HashEntry, hash_function_1, hash_function_2,
+                        batch_hash)
+from hash_functions import fmix64, fmix64_batch
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# Control bytes. A full slot holds the 7-bit tag of its hash (0 to 127).
+_EMPTY = 0x80
+_DELETED = 0xFE
+
+# Slots per group, scanned together.
+_GROUP_SIZE = 16
+
+# The table grows once its full and deleted slots would exceed 7/8 of it.
+_MAX_LOAD_NUMERATOR, _MAX_LOAD_DENOMINATOR = 7, 8
+
+
+class HashMap:
+    """
+    SwissTable style open addressing HashMap with the same public API as
+    the quadratic probing HashMap of hash_map_oa, including the batch
+    operations. Keys, values and cached hashes are held in parallel flat
+    lists, and the control bytes in a bytearray, so no HashEntry object is
+    created per slot.
+
+    The capacity is a power of two, and at least one group. The hash of a
+    key is run through fmix64(): its low 7 bits are the tag, and the
+    other bits pick the group the probe starts from. Groups are then
+    probed in triangular order (offsets 1, 3, 6, 10, ...), which visits
+    every group, until one holds an empty slot.
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        SwissTable group probing for collision resolution
+        """
+        # capacity must be a power of two, of at least one group
+        self._capacity = self._next_capacity(capacity)
+        self._allocate(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap.
+        """
+        out = ''
+        for i in range(self._capacity):
+            slot = None
+            if self._ctrl[i] != _EMPTY:
+                slot = HashEntry(self._keys[i], self._values[i])
+                slot.is_tombstone = self._ctrl[i] == _DELETED
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    @staticmethod
+    def _next_capacity(capacity: int) -> int:
+        """
+        Helper function that returns the smallest power of two that is at
+        least the given capacity and one group.
+        """
+        return 1 << (max(capacity, _GROUP_SIZE) - 1).bit_length()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+    def _allocate(self, capacity: int) -> None:
+        """
+        Helper function that allocates empty slot arrays of the given capacity.
+        """
+        self._ctrl = bytearray([_EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [None] * capacity
+        self._group_mask = capacity // _GROUP_SIZE - 1
+
+    def _hash(self, key: str) -> int:
+        """
+        Helper function that returns the hash function of the key, run
+        through fmix64() so that both the tag and the group bits are mixed.
+        """
+        return fmix64(self._hash_function(key) & _MASK64)
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Helper function that returns the index of the slot holding the key
+        given its hash, or -1 if the key is not in the hash map.
+
+        Each group is scanned for control bytes equal to the tag of the
+        hash, with bytearray.find() rather than one slot at a time, and the
+        probe stops at the first group holding an empty slot.
+        """
+        ctrl = self._ctrl
+        tag = hash & 0x7F
+        mask = self._group_mask
+        group = (hash >> 7) & mask
+        step = 1
+        while True:
+            start = group * _GROUP_SIZE
+            end = start + _GROUP_SIZE
+            i = ctrl.find(tag, start, end)
+            while i != -1:
+                if self._hashes[i] == hash and self._keys[i] == key:
+                    return i
+                i = ctrl.find(tag, i + 1, end)
+            if ctrl.find(_EMPTY, start, end) != -1:
+                return -1
+            group = (group + step) & mask
+            step += 1
+
+    def _find_slot(self, hash: int) -> int:
+        """
+        Helper function that returns the first empty or deleted slot of the
+        probe sequence of the hash, where a key that is not in the hash map
+        is inserted.
+        """
+        ctrl = self._ctrl
+        mask = self._group_mask
+        group = (hash >> 7) & mask
+        step = 1
+        while True:
+            start = group * _GROUP_SIZE
+            end = start + _GROUP_SIZE
+            i = ctrl.find(_DELETED, start, end)
+            if i == -1:
+                i = ctrl.find(_EMPTY, start, end)
+            if i != -1:
+                return i
+            group = (group + step) & mask
+            step += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates the key/value pair in the hash map. If the given key
+        already exists in the hash map, its associated value is replaced
+        with the new value. If the given key is not in the hash map, a
+        new key/value pair is added.
+
+        The table is resized to double its current capacity when adding
+        the pair would take the full and deleted slots above 7/8 of it, or
+        rehashed in place if at least half of those are deleted.
+        """
+        self._put(key, value, self._hash(key))
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Helper function that puts the key/value pair given the hash of the
+        key.
+        """
+        i = self._find(key, hash)
+        if i != -1:
+            self._values[i] = value
+            return
+
+        used = self._size + self._tombstones + 1
+        if used * _MAX_LOAD_DENOMINATOR > self._capacity * _MAX_LOAD_NUMERATOR:
+            if self._tombstones >= self._size:
+                self._rehash(self._capacity)
+            else:
+                self._rehash(2 * self._capacity)
+
+        i = self._find_slot(hash)
+        if self._ctrl[i] == _DELETED:
+            self._tombstones -= 1
+        self._ctrl[i] = hash & 0x7F
+        self._keys[i] = key
+        self._values[i] = value
+        self._hashes[i] = hash
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the current hash table load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the capacity of the internal hash table. All existing
+        key/value pairs remain in the new hash map, and all hash table
+        links are rehashed.
+
+        The method does nothing if new_capacity less than the current
+        number of elements in the hash map. If new_capacity is valid, it is
+        rounded up to a power of two, which then keeps doubling until the
+        entries fill at most 7/8 of it.
+        """
+        # Capacity must be larger than current number of elements.
+        if new_capacity < self._size:
+            return
+
+        # Capacity must be a power of two.
+        new_capacity = self._next_capacity(new_capacity)
+        while self._size * _MAX_LOAD_DENOMINATOR > new_capacity * _MAX_LOAD_NUMERATOR:
+            new_capacity *= 2
+
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Helper function that places every entry into new slot arrays of the
+        given (power of two) capacity, using the cached hashes, and drops
+        the deleted slots. The hash map size does not change.
+        """
+        prev_ctrl, prev_keys = self._ctrl, self._keys
+        prev_values, prev_hashes = self._values, self._hashes
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+        self._tombstones = 0
+
+        ctrl, keys, values, hashes = self._ctrl, self._keys, self._values, self._hashes
+        for k in range(len(prev_ctrl)):
+            if prev_ctrl[k] & 0x80:
+                continue
+            hash = prev_hashes[k]
+            i = self._find_slot(hash)
+            ctrl[i] = hash & 0x7F
+            keys[i], values[i], hashes[i] = prev_keys[k], prev_values[k], hash
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key. If the key is
+        not in the hash map, the method returns None.
+        """
+        i = self._find(key, self._hash(key))
+        if i != -1:
+            return self._values[i]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise it
+        returns False. An empty hash map does not contain any keys.
+        """
+        if self._size == 0:
+            return False
+        return self._find(key, self._hash(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its associated value from the hash map.
+        If the key is not in the hash map, the method does nothing.
+        """
+        self._remove(key, self._hash(key))
+
+    def _remove(self, key: str, hash: int) -> None:
+        """
+        Helper function that removes the key given its hash, if present.
+
+        The slot is marked deleted, unless its group still holds an empty
+        slot: then no probe has ever passed through the group, so the slot
+        can be emptied instead.
+        """
+        i = self._find(key, hash)
+        if i == -1:
+            return
+
+        start = i - i % _GROUP_SIZE
+        if self._ctrl.find(_EMPTY, start, start + _GROUP_SIZE) != -1:
+            self._ctrl[i] = _EMPTY
+        else:
+            self._ctrl[i] = _DELETED
+            self._tombstones += 1
+        self._keys[i] = self._values[i] = self._hashes[i] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears the contents of the hash map. It does not change the
+        underlying hash table capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array where each index contains a tuple of a
+        key/value pair stored in the hash map. The results are unsorted.
+        """
+        da = DynamicArray()
+        for i in range(self._capacity):
+            if not self._ctrl[i] & 0x80:
+                da.append((self._keys[i], self._values[i]))
+        return da
+
+    # ------------------------------------------------------------------ #
+    def _batch_hashes(self, keys: list) -> list:
+        """
+        Helper function that returns the hashes of the keys, as _hash()
+        would, computed in one batch.
+        """
+        return fmix64_batch(batch_hash(self._hash_function, keys))
+
+    def _batch_misses(self, hashes: list) -> list:
+        """
+        Helper function that returns, for each of the hashes, True if the
+        first group of its probe sequence proves its key is not in the hash
+        map: no control byte of the group matches the tag of the hash, and
+        the group holds an empty slot. All the groups are scanned at once
+        with NumPy; without it, no key is ruled out.
+        """
+        if np is None or not hashes:
+            return [False] * len(hashes)
+        array = np.array(hashes, dtype=np.uint64)
+        tags = (array & np.uint64(0x7F)).astype(np.uint8)
+        groups = ((array >> np.uint64(7)) & np.uint64(self._group_mask)).astype(np.intp)
+
+        ctrl = np.frombuffer(self._ctrl, dtype=np.uint8).reshape(-1, _GROUP_SIZE)
+        scanned = ctrl[groups]
+        matched = (scanned == tags[:, None]).any(axis=1)
+        open_group = (scanned == _EMPTY).any(axis=1)
+        return (open_group & ~matched).tolist()
+
+    def put_many(self, pairs) -> None:
+        """
+        Updates the hash map with every key/value pair of the given iterable,
+        as if put() was called on each pair in order.
+
+        The table is resized once, up front, to hold every pair, and the
+        keys are hashed in one batch.
+        """
+        pairs = list(pairs)
+        count = self._size + len(pairs)
+        if count * _MAX_LOAD_DENOMINATOR > self._capacity * _MAX_LOAD_NUMERATOR:
+            self.resize_table(count)
+
+        hashes = self._batch_hashes([key for key, _ in pairs])
+        for (key, value), hash in zip(pairs, hashes):
+            self._put(key, value, hash)
+
+    @classmethod
+    def from_pairs(cls, pairs, function=hash_function_1) -> "HashMap":
+        """
+        Builds a new hash map from an iterable of key/value pairs. The table
+        is sized once for all of the pairs.
+        """
+        hash_map = cls(1, function)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def get_many(self, keys) -> list:
+        """
+        Returns a list with the value associated with each of the given keys,
+        in order, or None for the keys not in the hash map. The keys are
+        hashed in one batch, and the first group of every key is scanned in
+        one vectorized pass; only the keys it does not rule out are probed.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return [None] * len(keys)
+
+        hashes = self._batch_hashes(keys)
+        values = []
+        for key, hash, miss in zip(keys, hashes, self._batch_misses(hashes)):
+            i = -1 if miss else self._find(key, hash)
+            values.append(None if i == -1 else self._values[i])
+        return values
+
+    def contains_many(self, keys) -> list:
+        """
+        Returns a list with, for each of the given keys in order, True if the
+        key is in the hash map and False otherwise. Same batching as
+        get_many().
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return [False] * len(keys)
+
+        hashes = self._batch_hashes(keys)
+        return [not miss and self._find(key, hash) != -1
+                for key, hash, miss in zip(keys, hashes, self._batch_misses(hashes))]
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys and its associated value from the
+        hash map, skipping keys that are not in the hash map. The keys are
+        hashed in one batch.
+        """
+        keys = list(keys)
+        if self._size == 0:
+            return
+
+        for key, hash in zip(keys, self._batch_hashes(keys)):
+            self._remove(key, hash)
+
+    def __iter__(self):
+        """
+        Enables the hash map to iterate across itself. Builds the
+        iterator functionality inside the HashMap class.
+        """
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Return a HashEntry snapshot of the next entry in the hash map,
+        based on the current location of the iterator.
+        """
+        while True:
+            if self._index == self._capacity:
+                raise StopIteration
+            i = self._index
+            self._index += 1
+            if not self._ctrl[i] & 0x80:
+                return HashEntry(self._keys[i], self._values[i], self._hashes[i])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nSwissTable - put example 1")
+    print("--------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nSwissTable - remove example 1")
+    print("-----------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.contains_key('str0'), m.get('str1'))
+
+    print("\nSwissTable - resize example 1")
+    print("-----------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nSwissTable - get_many example 1")
+    print("-------------------------------")
+    m = HashMap.from_pairs((str(i), i) for i in range(0, 100, 3))
+    print(m.get_many(str(i) for i in range(10)))
+    print(m.contains_many(str(i) for i in range(10)))
+
+    print("\nSwissTable - __iter__(), __next__() example 1")
+    print("---------------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,80 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Optional instrumentation shared by the HashMaps (SC & OA).
+#              A map only records into a MapStats once enable_stats() has
+#              been called on it; until then each operation pays for a single
+#              `is not None` check.
+
+
+class MapStats:
+    """
+    Counters recorded by an instrumented hash map: probe length histograms
+    of the lookups that found their key (hits) and of those that did not
+    (misses, which include the inserts of new keys), the number of resizes
+    and the time spent in them, and the number of tombstones reused.
+
+    If a hook is given, it is called as hook(event, details) after each
+    resize ('resize') and after each probe of at least long_probe slots
+    ('long_probe'), so degradation can be reported as it happens.
+
+    A lookup records one probe per table it searches: two during an
+    incremental resize when the key is not found in the new table.
+    """
+
+    def __init__(self, hook=None, long_probe: int = 16) -> None:
+        """
+        Initialize empty counters.
+        """
+        self._hook = hook
+        self._long_probe = long_probe
+        self.probe_hits = {}
+        self.probe_misses = {}
+        self.resizes = 0
+        self.resize_seconds = 0.0
+        self.tombstones_reused = 0
+
+    def record_probe(self, hit: bool, length: int) -> None:
+        """
+        Records a probe sequence that examined length slots.
+        """
+        histogram = self.probe_hits if hit else self.probe_misses
+        histogram[length] = histogram.get(length, 0) + 1
+        if length >= self._long_probe and self._hook is not None:
+            self._hook('long_probe', {'length': length, 'hit': hit})
+
+    def record_tombstone_reuse(self) -> None:
+        """
+        Records an insert into a slot held by a tombstone.
+        """
+        self.tombstones_reused += 1
+
+    def record_resize(self, old_capacity: int, new_capacity: int, seconds: float) -> None:
+        """
+        Records a resize (or in-place purge) of the table, and the time
+        spent moving the entries, if they were moved at once.
+        """
+        self.resizes += 1
+        self.resize_seconds += seconds
+        if self._hook is not None:
+            self._hook('resize', {'old_capacity': old_capacity,
+                                  'new_capacity': new_capacity,
+                                  'seconds': seconds})
+
+    def record_migration(self, seconds: float) -> None:
+        """
+        Records the time spent on one step of an incremental resize.
+        """
+        self.resize_seconds += seconds
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the counters as a plain dictionary. Histograms map
+        each probe length to the number of probes of that length.
+        """
+        return {
+            'probe_hits': dict(sorted(self.probe_hits.items())),
+            'probe_misses': dict(sorted(self.probe_misses.items())),
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+            'tombstones_reused': self.tombstones_reused,
+        }
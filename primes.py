@@ -0,0 +1,54 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Prime capacity selection shared by the HashMaps (SC & OA).
+#              Capacities are checked with a deterministic Miller-Rabin
+#              test instead of trial division.
+
+
+# Witnesses that make Miller-Rabin deterministic for n < 3.3 * 10 ** 24
+# (the prime bases up to 37 alone only go up to 3.18 * 10 ** 23).
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Determine if given integer is a prime number and return boolean.
+    Uses trial division by the witnesses, then Miller-Rabin.
+    """
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+
+    # Write n - 1 as d * 2 ** s with d odd.
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(n: int) -> int:
+    """
+    Increment from given number to find the closest odd prime number,
+    i.e. the smallest odd prime greater than or equal to n.
+    """
+    if n % 2 == 0:
+        n += 1
+
+    while not is_prime(n):
+        n += 2
+
+    return n
@@ -0,0 +1,96 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Differential checks shared by the HashMap tests: the same
+#              random operations are applied to a map and to a dict, and
+#              every result and size must agree.
+
+import random
+
+from a6_include import hash_function_1, hash_function_2
+from hash_functions import builtin_hash
+
+# The two course functions collide heavily; builtin_hash() barely does.
+HASH_FUNCTIONS = [hash_function_1, hash_function_2, builtin_hash]
+
+
+def contents(hash_map) -> dict:
+    """Returns the key/value pairs of the map as a dict."""
+    pairs = hash_map.get_keys_and_values()
+    return {pairs[i][0]: pairs[i][1] for i in range(pairs.length())}
+
+
+def run_against_dict(hash_map, seed: int, steps: int = 2000, keys: int = 300,
+                     resize: bool = True) -> dict:
+    """
+    Applies steps random puts, removes, lookups, clears and (if resize is
+    True) explicit resizes over keys distinct keys to the map and to a dict,
+    asserting that they agree after each one. Returns the dict.
+    """
+    rnd = random.Random(seed)
+    expected = {}
+    for step in range(steps):
+        op = rnd.random()
+        key = 'key' + str(rnd.randrange(keys))
+        if op < 0.45:
+            hash_map.put(key, step)
+            expected[key] = step
+        elif op < 0.65:
+            hash_map.remove(key)
+            expected.pop(key, None)
+        elif op < 0.8:
+            assert hash_map.get(key) == expected.get(key)
+        elif op < 0.95:
+            assert hash_map.contains_key(key) == (key in expected)
+        elif op < 0.955:
+            hash_map.clear()
+            expected.clear()
+        elif resize:
+            hash_map.resize_table(rnd.randrange(1, 2 * len(expected) + 20))
+        assert hash_map.get_size() == len(expected)
+    assert contents(hash_map) == expected
+    return expected
+
+
+def run_batches_against_dict(hash_map, seed: int, steps: int = 600,
+                             keys: int = 300) -> dict:
+    """
+    Applies steps random put_many(), remove_many(), get_many(),
+    contains_many() and clear() calls, on batches of up to 20 keys with
+    repeats, over keys distinct keys to the map and to a dict, asserting
+    that they agree after each one. Returns the dict.
+    """
+    rnd = random.Random(seed)
+    expected = {}
+    for step in range(steps):
+        op = rnd.random()
+        batch = ['key' + str(rnd.randrange(keys)) for _ in range(rnd.randrange(20))]
+        if op < 0.4:
+            pairs = [(key, (step, i)) for i, key in enumerate(batch)]
+            hash_map.put_many(pairs)
+            expected.update(pairs)
+        elif op < 0.6:
+            hash_map.remove_many(batch)
+            for key in batch:
+                expected.pop(key, None)
+        elif op < 0.8:
+            assert hash_map.get_many(batch) == [expected.get(key) for key in batch]
+        elif op < 0.99:
+            assert hash_map.contains_many(batch) == [key in expected for key in batch]
+        else:
+            hash_map.clear()
+            expected.clear()
+        assert hash_map.get_size() == len(expected)
+    assert contents(hash_map) == expected
+    return expected
+
+
+class CountingHash:
+    """Hash function wrapper that counts its calls."""
+
+    def __init__(self, function) -> None:
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, key: str) -> int:
+        self.calls += 1
+        return self.function(key)
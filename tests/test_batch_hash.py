@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+import a6_include
+import hash_functions
+from a6_include import batch_hash, hash_function_1, hash_function_2
+from hash_functions import builtin_hash, finalized
+
+FUNCTIONS = [hash_function_1, hash_function_2, finalized(hash_function_1),
+             finalized(hash_function_2), finalized(builtin_hash)]
+
+
+def random_keys(seed: int, count: int = 2000) -> list:
+    """Random keys of ASCII, BMP and astral plane characters (no surrogates)."""
+    rnd = random.Random(seed)
+    alphabet = [chr(point) for point in range(32, 127)]
+    alphabet += ['\u00e9', '\u4e2d', '\U0001F600', '\U0002F800']
+    return [''.join(rnd.choice(alphabet) for _ in range(rnd.randrange(20)))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('function', FUNCTIONS)
+def test_batch_matches_scalar(function):
+    keys = random_keys(0) + ['', 'a' * 5000]
+    assert batch_hash(function, keys) == [function(key) for key in keys]
+    assert batch_hash(function, []) == []
+
+
+@pytest.mark.parametrize('function', FUNCTIONS)
+def test_batch_matches_scalar_without_numpy(function, monkeypatch):
+    monkeypatch.setattr(a6_include, 'np', None)
+    monkeypatch.setattr(hash_functions, 'np', None)
+    keys = random_keys(1)
+    assert batch_hash(function, keys) == [function(key) for key in keys]
+
+
+def test_overlong_keys_fall_back_to_the_scalar_function():
+    keys = ['ab', 'x' * (a6_include._MAX_BATCH_KEY_LENGTH + 1)]
+    assert batch_hash(hash_function_2, keys) == [hash_function_2(key) for key in keys]
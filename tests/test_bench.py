@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from bench.runner import _load, _replay, run
+from bench.targets import FIND_MODE, TARGETS
+from bench.workloads import WORKLOADS, find_mode_input
+from tests.differential import contents
+
+
+@pytest.mark.parametrize('name', WORKLOADS)
+@pytest.mark.parametrize('target', [target for target in TARGETS if target != 'dict'])
+def test_targets_replay_workloads_like_dict(target, name):
+    workload = WORKLOADS[name](300, random.Random(261))
+    hash_map, expected = _load(TARGETS[target], workload), _load(TARGETS['dict'], workload)
+    _replay(hash_map, workload.ops)
+    _replay(expected, workload.ops)
+    assert hash_map.get_size() == expected.get_size()
+    assert contents(hash_map) == expected._data
+
+
+def test_find_mode_targets_agree():
+    da = find_mode_input(2000, random.Random(261))
+    results = []
+    for find_mode in FIND_MODE.values():
+        mode, frequency = find_mode(da)
+        if hasattr(mode, 'length'):
+            mode = [mode[i] for i in range(mode.length())]
+        results.append((sorted(mode), frequency))
+    assert results.count(results[0]) == len(results)
+
+
+def test_run_reports_every_target_and_workload():
+    report = run(['sc/hash_function_1', 'dict'], list(WORKLOADS) + ['find_mode'], 100, 1, 0)
+    rows = {(row['target'], row['workload']) for row in report['results']}
+    assert rows == {(target, name) for target in ('sc/hash_function_1', 'dict')
+                    for name in list(WORKLOADS) + ['find_mode']}
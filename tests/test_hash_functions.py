@@ -0,0 +1,60 @@
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from hash_functions import (HASH_FUNCTIONS, fmix64, fmix64_batch, fnv1a, get_hash_function,
+                            make_siphash, register_hash_function, report, siphash24)
+from tests.differential import run_against_dict
+
+
+def test_fnv1a_reference_vectors():
+    assert fnv1a('') == 0xCBF29CE484222325
+    assert fnv1a('a') == 0xAF63DC4C8601EC8C
+    assert fnv1a('foobar') == 0x85944171F73967E8
+
+
+def test_siphash24_reference_vectors():
+    # Key 00 01 .. 0f, messages 00 01 .. of each length (SipHash paper).
+    k0, k1 = 0x0706050403020100, 0x0F0E0D0C0B0A0908
+    assert siphash24(k0, k1, b'') == 0x726FDB47DD0E0E31
+    assert siphash24(k0, k1, bytes(range(8))) == 0x93F5F5799A932462
+    assert siphash24(k0, k1, bytes(range(15))) == 0xA129CA6149BE45E5
+
+
+def test_siphash_seeds():
+    assert make_siphash(261)('key') == make_siphash(261)('key')
+    assert make_siphash(261)('key') != make_siphash(262)('key')
+
+
+def test_fmix64_batch_matches_fmix64():
+    hashes = [0, 1, 2 ** 64 - 1, 2 ** 64, -1, 12345678901234567890]
+    assert fmix64_batch(hashes) == [fmix64(hash & (2 ** 64 - 1)) for hash in hashes]
+
+
+def test_registry():
+    assert get_hash_function() is HASH_FUNCTIONS['builtin']
+    register_hash_function('length', len)
+    try:
+        assert get_hash_function('length') is len
+    finally:
+        del HASH_FUNCTIONS['length']
+    with pytest.raises(KeyError):
+        get_hash_function('length')
+
+
+@pytest.mark.parametrize('name', HASH_FUNCTIONS)
+@pytest.mark.parametrize('map_class', [hash_map_oa.HashMap, hash_map_sc.HashMap])
+def test_maps_work_with_every_registered_function(map_class, name):
+    run_against_dict(map_class(11, HASH_FUNCTIONS[name]), 5, steps=600)
+
+
+def test_report_covers_every_function():
+    rows = report(n=500)
+    assert [row['name'] for row in rows] == list(HASH_FUNCTIONS)
+    for row in rows:
+        assert 0 <= row['prime_empty_fraction'] <= 1
+        assert 0 < row['anagram_distinct'] <= 1
+    # Unlike the course functions, the mixed ones tell anagrams apart.
+    distinct = {row['name']: row['anagram_distinct'] for row in rows}
+    assert distinct['hash_function_1'] < 0.01
+    assert distinct['fnv1a'] == distinct['siphash'] == distinct['builtin'] == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from hash_map_cuckoo import HashMap
+from tests.differential import HASH_FUNCTIONS, contents, run_against_dict
+
+# Slots per bucket, as in hash_map_cuckoo.
+BUCKET_SIZE = 4
+
+
+def check_placement(hash_map):
+    """Asserts that every table entry sits in one of its two buckets."""
+    slots = hash_map._slots
+    for i in range(hash_map.get_capacity()):
+        entry = slots[i]
+        if entry is not None:
+            assert i // BUCKET_SIZE in hash_map._buckets_of(entry.hash)
+    assert hash_map._stash.length() <= 4
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('max_load', [0.5, 0.9])
+def test_matches_dict(function, max_load):
+    hash_map = HashMap(11, function, max_load)
+    run_against_dict(hash_map, 7)
+    check_placement(hash_map)
+    assert hash_map.get_entries().length() == hash_map.get_size()
+
+
+def test_well_mixed_hash_keeps_the_lookup_bound():
+    hash_map = HashMap(11, HASH_FUNCTIONS[2])
+    for i in range(20000):
+        hash_map.put('str' + str(i), i)
+    check_placement(hash_map)
+    assert all(chain is None for chain in hash_map._overflow)
+    assert contents(hash_map) == {'str' + str(i): i for i in range(20000)}
+
+
+def test_course_hash_overflows_into_chains():
+    # Keys sharing their whole hash can only be kept in the chains.
+    hash_map = HashMap(11, HASH_FUNCTIONS[0])
+    keys = ['ab' * n + 'ba' * (20 - n) for n in range(21)]
+    for i, key in enumerate(keys):
+        hash_map.put(key, i)
+    assert any(chain is not None for chain in hash_map._overflow)
+    assert contents(hash_map) == {key: i for i, key in enumerate(keys)}
+    for key in keys[::2]:
+        hash_map.remove(key)
+    assert contents(hash_map) == {key: i for i, key in enumerate(keys) if i % 2}
+    check_placement(hash_map)
+
+
+@pytest.mark.parametrize('max_load', [0, 1, 1.5])
+def test_rejects_invalid_max_load(max_load):
+    with pytest.raises(ValueError):
+        HashMap(11, HASH_FUNCTIONS[2], max_load)
@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from hash_map_hopscotch import HashMap
+from tests.differential import HASH_FUNCTIONS, contents, run_against_dict
+
+# Size of the neighborhood of a home slot, as in hash_map_hopscotch.
+NEIGHBORHOOD = 32
+
+
+def check_neighborhoods(hash_map):
+    """Asserts that every entry is in, and recorded by, its neighborhood."""
+    m = hash_map.get_capacity()
+    filled = 0
+    for i in range(m):
+        if hash_map._hashes[i] is None:
+            continue
+        filled += 1
+        home = hash_map._hashes[i] % m
+        distance = (i - home) % m
+        assert distance < NEIGHBORHOOD
+        assert hash_map._hops[home] >> distance & 1
+    assert sum(bin(hop).count('1') for hop in hash_map._hops) == filled
+    assert hash_map.empty_buckets() == m - filled
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('max_load', [0.5, 0.9, 0.99])
+def test_matches_dict(function, max_load):
+    hash_map = HashMap(11, function, max_load)
+    run_against_dict(hash_map, 9)
+    check_neighborhoods(hash_map)
+
+
+def test_high_load_keeps_the_neighborhoods():
+    hash_map = HashMap(11, HASH_FUNCTIONS[2], 0.99)
+    for i in range(3000):
+        hash_map.put('key' + str(i), i)
+        if i % 100 == 0:
+            check_neighborhoods(hash_map)
+    assert contents(hash_map) == {'key' + str(i): i for i in range(3000)}
+
+
+def test_shared_hashes_overflow_into_chains():
+    # Anagrams share their hash_function_1 hash, so their home slot.
+    keys = [''.join(p) for p in itertools.islice(itertools.permutations('abcdef'), 100)]
+    hash_map = HashMap(11, HASH_FUNCTIONS[0])
+    for i, key in enumerate(keys):
+        hash_map.put(key, i)
+    assert any(chain is not None for chain in hash_map._overflow)
+    check_neighborhoods(hash_map)
+    for key in keys[:60]:
+        hash_map.remove(key)
+    check_neighborhoods(hash_map)
+    assert contents(hash_map) == {key: i for i, key in enumerate(keys) if i >= 60}
+
+
+@pytest.mark.parametrize('max_load', [0, 1, 1.5])
+def test_rejects_invalid_max_load(max_load):
+    with pytest.raises(ValueError):
+        HashMap(11, HASH_FUNCTIONS[2], max_load)
@@ -0,0 +1,272 @@
+import random
+
+import pytest
+
+from hash_map_oa import HashMap, SoAHashMap
+from tests.differential import (HASH_FUNCTIONS, CountingHash, contents, run_against_dict,
+                                run_batches_against_dict)
+
+
+@pytest.fixture(params=[HashMap, SoAHashMap], ids=lambda cls: cls.__name__)
+def map_class(request):
+    """Both storage engines must behave the same."""
+    return request.param
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('seed', range(3))
+def test_matches_dict(map_class, function, seed):
+    run_against_dict(map_class(11, function), seed)
+
+
+def test_put_updates_in_place(map_class):
+    hash_map = map_class(11, HASH_FUNCTIONS[0])
+    for value in range(5):
+        hash_map.put('key', value)
+    assert hash_map.get_size() == 1
+    assert hash_map.get('key') == 4
+
+
+def test_grows_before_half_load(map_class):
+    hash_map = map_class(3, HASH_FUNCTIONS[1])
+    for i in range(500):
+        hash_map.put('key' + str(i), i)
+        # The load is checked before each insert, so it was below 0.5.
+        assert (hash_map.get_size() - 1) / hash_map.get_capacity() < 0.5
+    assert contents(hash_map) == {'key' + str(i): i for i in range(500)}
+
+
+def test_resizes_reuse_cached_hashes(map_class):
+    function = CountingHash(HASH_FUNCTIONS[2])
+    hash_map = map_class(3, function)
+    for i in range(1000):
+        hash_map.put('key' + str(i), i)
+    assert function.calls == 1000
+    hash_map.resize_table(5000)
+    assert function.calls == 1000
+    assert contents(hash_map) == {'key' + str(i): i for i in range(1000)}
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_put_many_matches_put(map_class, function):
+    pairs = [('key' + str(i % 700), i) for i in range(1000)]
+    hash_map = map_class(11, function)
+    hash_map.put('key3', 'old')
+    hash_map.put_many(iter(pairs))
+    assert contents(hash_map) == dict([('key3', 'old')] + pairs)
+    assert contents(map_class.from_pairs(pairs, function)) == dict(pairs)
+
+
+def test_put_many_sizes_the_table_up_front(map_class, monkeypatch):
+    resizes = []
+    monkeypatch.setattr(map_class, '_resize', lambda self, capacity: resizes.append(capacity))
+    hash_map = map_class.from_pairs(('key' + str(i), i) for i in range(1000))
+    assert resizes == []
+    assert hash_map.get_size() == 1000
+
+
+def test_churn_purges_tombstones_in_place(map_class):
+    hash_map = map_class(11, HASH_FUNCTIONS[2])
+    hash_map.verify_counters = True
+    for i in range(100):
+        hash_map.put('key' + str(i), i)
+    capacity = hash_map.get_capacity()
+    for i in range(100, 5000):
+        hash_map.remove('key' + str(i - 100))
+        hash_map.put('key' + str(i), i)
+        # tombstone_ratio() also checks the counters against the table,
+        # and the purge runs before an insert fills one more slot.
+        occupied = hash_map.table_load() + hash_map.tombstone_ratio()
+        assert occupied - 1 / capacity < 0.75
+        assert hash_map.get_capacity() == capacity
+    assert contents(hash_map) == {'key' + str(i): i for i in range(4900, 5000)}
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_counters_match_the_table(map_class, function):
+    hash_map = map_class(11, function)
+    hash_map.verify_counters = True
+    run_against_dict(hash_map, 0)
+    hash_map.empty_buckets()
+    hash_map.tombstone_ratio()
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_storage_engines_lay_out_the_same_table(function):
+    entries, arrays = HashMap(11, function), SoAHashMap(11, function)
+    run_against_dict(entries, 1)
+    run_against_dict(arrays, 1)
+    assert str(arrays) == str(entries)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('seed', range(2))
+def test_batches_match_dict(map_class, function, seed):
+    run_batches_against_dict(map_class(11, function), seed)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('seed', range(2))
+def test_incremental_matches_dict(map_class, function, seed):
+    run_against_dict(map_class(11, function, incremental=True), seed)
+    run_batches_against_dict(map_class(11, function, incremental=True), seed)
+
+
+def test_incremental_resize_keeps_keys_readable(map_class):
+    hash_map = map_class(11, HASH_FUNCTIONS[2], incremental=True)
+    resizing = 0
+    for i in range(3000):
+        hash_map.put('key' + str(i), i)
+        if hash_map.stats()['resizing']:
+            resizing += 1
+            assert hash_map.get('key' + str(i // 2)) == i // 2
+            assert hash_map.get_size() == i + 1
+    assert resizing > 0
+    assert contents(hash_map) == {'key' + str(i): i for i in range(3000)}
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_stats_count_each_lookup_once(map_class, function):
+    hash_map = map_class(11, function)
+    hash_map.put_many(('key' + str(i), i) for i in range(500))
+    keys = ['key' + str(i) for i in range(800)]
+    hash_map.enable_stats()
+    for key in keys:
+        hash_map.get(key)
+    stats = hash_map.stats()
+    assert sum(stats['probe_hits'].values()) == 500
+    assert sum(stats['probe_misses'].values()) == 300
+    assert min(stats['probe_hits']) >= 1
+
+    # The batch lookups record the same probes.
+    for lookup in (hash_map.get_many, hash_map.contains_many):
+        hash_map.enable_stats()
+        lookup(keys)
+        batch = hash_map.stats()
+        assert batch['probe_hits'] == stats['probe_hits']
+        assert batch['probe_misses'] == stats['probe_misses']
+    hash_map.disable_stats()
+    assert hash_map.stats()['probe_hits'] == {}
+
+
+def test_stats_hook_reports_resizes(map_class):
+    events = []
+    hash_map = map_class(11, HASH_FUNCTIONS[2])
+    hash_map.enable_stats(lambda event, details: events.append((event, details)))
+    for i in range(200):
+        hash_map.put('key' + str(i), i)
+    resizes = [details for event, details in events if event == 'resize']
+    assert len(resizes) == hash_map.stats()['resizes'] > 0
+    assert resizes[-1]['new_capacity'] == hash_map.get_capacity()
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_stats_do_not_change_results(map_class, function):
+    for run in (run_against_dict, run_batches_against_dict):
+        hash_map = map_class(11, function, incremental=True)
+        hash_map.enable_stats()
+        run(hash_map, 2)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('incremental', [False, True])
+def test_occupancy_reads_match_the_table(map_class, function, incremental):
+    hash_map = map_class(11, function, incremental=incremental)
+    hash_map.verify_counters = True
+    rnd = random.Random(0)
+    for step in range(3000):
+        key = 'key' + str(rnd.randrange(1500))
+        if rnd.random() < 0.7:
+            hash_map.put(key, step)
+        else:
+            hash_map.remove(key)
+        if step % 7 == 0:
+            # During a resize, every entry left in the old table will fill
+            # one empty slot of the new one.
+            stats = hash_map.stats()
+            empty = stats['capacity'] - stats['size'] - stats['tombstones']
+            assert hash_map.empty_buckets() == empty
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('incremental', [False, True])
+def test_lazy_clear_matches_dict(map_class, function, incremental):
+    for run in (run_against_dict, run_batches_against_dict):
+        hash_map = map_class(11, function, incremental=incremental, lazy_clear=True)
+        hash_map.verify_counters = True
+        run(hash_map, 3)
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_lazy_clear_forgets_every_key(map_class, incremental):
+    hash_map = map_class(11, HASH_FUNCTIONS[2], incremental=incremental, lazy_clear=True)
+    for generation in range(3):
+        for i in range(300):
+            hash_map.put('key' + str(i), generation)
+        hash_map.clear()
+        assert hash_map.get_size() == 0
+        assert hash_map.empty_buckets() == hash_map.get_capacity()
+        assert not any(hash_map.contains_many(['key' + str(i) for i in range(300)]))
+    hash_map.put('key7', 'new')
+    assert contents(hash_map) == {'key7': 'new'}
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('incremental', [False, True])
+def test_shrink_matches_dict(map_class, function, incremental):
+    for run in (run_against_dict, run_batches_against_dict):
+        hash_map = map_class(11, function, incremental=incremental, shrink=True)
+        hash_map.verify_counters = True
+        run(hash_map, 4)
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_shrink_after_mass_deletion(map_class, incremental):
+    hash_map = map_class(20, HASH_FUNCTIONS[2], incremental=incremental, shrink=True)
+    initial = hash_map.get_capacity()
+    hash_map.put_many(('key' + str(i), i) for i in range(3000))
+    grown = hash_map.get_capacity()
+    for i in range(2990):
+        hash_map.remove('key' + str(i))
+    assert initial <= hash_map.get_capacity() < grown / 10
+    assert contents(hash_map) == {'key' + str(i): i for i in range(2990, 3000)}
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_shrink_hysteresis(map_class, incremental):
+    hash_map = map_class(11, HASH_FUNCTIONS[2], incremental=incremental, shrink=True)
+    hash_map.put_many(('key' + str(i), i) for i in range(3000))
+    hash_map.enable_stats()
+    i = 0
+    while hash_map.stats()['resizes'] == 0:
+        hash_map.remove('key' + str(i))
+        i += 1
+
+    # Going back and forth over the point where the table shrank does not
+    # resize it again.
+    for _ in range(100):
+        hash_map.put('key' + str(i - 1), None)
+        hash_map.remove('key' + str(i - 1))
+    assert hash_map.stats()['resizes'] == 1
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('modes', [{}, {'incremental': True},
+                                   {'incremental': True, 'lazy_clear': True, 'shrink': True}])
+def test_pow2_matches_dict(map_class, function, modes):
+    for run in (run_against_dict, run_batches_against_dict):
+        hash_map = map_class(11, function, pow2=True, **modes)
+        hash_map.verify_counters = True
+        run(hash_map, 5)
+
+
+def test_pow2_capacities(map_class):
+    hash_map = map_class(11, HASH_FUNCTIONS[0], pow2=True)
+    assert hash_map.get_capacity() == 16
+    capacities = set()
+    for i in range(2000):
+        hash_map.put('key' + str(i), i)
+        capacities.add(hash_map.get_capacity())
+    hash_map.resize_table(5000)
+    capacities.add(hash_map.get_capacity())
+    assert all(capacity & (capacity - 1) == 0 for capacity in capacities)
@@ -0,0 +1,44 @@
+import pytest
+
+from hash_map_robin_hood import HashMap
+from tests.differential import HASH_FUNCTIONS, contents, run_against_dict
+
+
+def check_robin_hood(hash_map):
+    """Asserts the probe distances and ordering of every run of slots."""
+    m = hash_map.get_capacity()
+    distances = hash_map._distances
+    for i in range(m):
+        if distances[i] < 0:
+            continue
+        assert distances[i] == (i - hash_map._hashes[i] % m) % m
+        # Along a run, the distance grows by at most one per slot.
+        assert distances[(i + 1) % m] <= distances[i] + 1
+    assert hash_map.empty_buckets() == sum(1 for d in distances if d < 0)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('max_load', [0.5, 0.9, 0.99])
+def test_matches_dict(function, max_load):
+    hash_map = HashMap(11, function, max_load)
+    run_against_dict(hash_map, 6)
+    check_robin_hood(hash_map)
+
+
+def test_high_load_keeps_the_invariants():
+    hash_map = HashMap(11, HASH_FUNCTIONS[2], 0.99)
+    for i in range(2000):
+        hash_map.put('key' + str(i), i)
+        if i % 50 == 0:
+            check_robin_hood(hash_map)
+    for i in range(0, 2000, 3):
+        hash_map.remove('key' + str(i))
+    check_robin_hood(hash_map)
+    assert hash_map.table_load() <= 0.99
+    assert contents(hash_map) == {'key' + str(i): i for i in range(2000) if i % 3}
+
+
+@pytest.mark.parametrize('max_load', [0, 1, 1.5])
+def test_rejects_invalid_max_load(max_load):
+    with pytest.raises(ValueError):
+        HashMap(11, HASH_FUNCTIONS[2], max_load)
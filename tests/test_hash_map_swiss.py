@@ -0,0 +1,46 @@
+import pytest
+
+from hash_map_swiss import HashMap
+from tests.differential import (HASH_FUNCTIONS, contents, run_against_dict,
+                                run_batches_against_dict)
+
+# Control bytes, as in hash_map_swiss.
+EMPTY, DELETED = 0x80, 0xFE
+
+
+def check_control_bytes(hash_map):
+    """Asserts that the control bytes match the slots and counters."""
+    ctrl = hash_map._ctrl
+    for i in range(hash_map.get_capacity()):
+        if ctrl[i] not in (EMPTY, DELETED):
+            assert ctrl[i] == hash_map._hashes[i] & 0x7F
+            assert hash_map._hashes[i] == hash_map._hash(hash_map._keys[i])
+    assert ctrl.count(DELETED) == hash_map._tombstones
+    assert ctrl.count(EMPTY) == hash_map.empty_buckets()
+    full = hash_map.get_capacity() - hash_map.empty_buckets() - hash_map._tombstones
+    assert full == hash_map.get_size()
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('seed', range(2))
+def test_matches_dict(function, seed):
+    hash_map = HashMap(11, function)
+    run_against_dict(hash_map, seed)
+    check_control_bytes(hash_map)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_batches_match_dict(function):
+    hash_map = HashMap(11, function)
+    run_batches_against_dict(hash_map, 8)
+    check_control_bytes(hash_map)
+
+
+def test_capacity_is_a_power_of_two_groups():
+    hash_map = HashMap(3, HASH_FUNCTIONS[2])
+    assert hash_map.get_capacity() == 16
+    hash_map.put_many(('key' + str(i), i) for i in range(5000))
+    capacity = hash_map.get_capacity()
+    assert capacity & (capacity - 1) == 0
+    assert hash_map.table_load() <= 7 / 8
+    assert contents(hash_map) == {'key' + str(i): i for i in range(5000)}
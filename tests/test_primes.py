@@ -0,0 +1,47 @@
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from hash_functions import builtin_hash
+from primes import is_prime, next_prime
+
+
+def trial_division(n: int) -> bool:
+    """Reference primality test."""
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+
+def test_matches_trial_division():
+    assert [is_prime(n) for n in range(20000)] == [trial_division(n) for n in range(20000)]
+
+
+@pytest.mark.parametrize('n', [
+    561,                            # Carmichael number
+    3215031751,                     # strong pseudoprime to bases 2, 3, 5, 7
+    3825123056546413051,            # strong pseudoprime to the primes up to 23
+    318665857834031151167461,       # strong pseudoprime to the primes up to 37
+])
+def test_rejects_strong_pseudoprimes(n):
+    assert not is_prime(n)
+
+
+@pytest.mark.parametrize('n', [2 ** 31 - 1, 2 ** 61 - 1, 2 ** 89 - 1])
+def test_accepts_large_primes(n):
+    assert is_prime(n)
+
+
+def test_next_prime_is_the_smallest_odd_prime_not_below():
+    primes = [n for n in range(3, 5000) if trial_division(n)]
+    for n in range(4900):
+        assert next_prime(n) == next(p for p in primes if p >= n)
+
+
+@pytest.mark.parametrize('map_class', [hash_map_oa.HashMap, hash_map_sc.HashMap])
+def test_maps_grow_onto_primes(map_class):
+    hash_map = map_class(10, builtin_hash)
+    capacities = set()
+    for i in range(3000):
+        hash_map.put('key' + str(i), i)
+        capacities.add(hash_map.get_capacity())
+    assert len(capacities) > 3
+    assert all(is_prime(capacity) for capacity in capacities)
@@ -0,0 +1,56 @@
+import contextlib
+
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, raw_buffer
+from bench.probes import _checked_access
+from tests.differential import HASH_FUNCTIONS, run_against_dict
+
+MAP_CLASSES = [hash_map_oa.HashMap, hash_map_oa.SoAHashMap,
+               hash_map_sc.HashMap, hash_map_sc.CompactHashMap]
+
+
+def test_raw_buffer_is_the_backing_list():
+    da = DynamicArray([1, 2, 3])
+    buffer = raw_buffer(da)
+    buffer[1] = 'two'
+    assert da[1] == 'two'
+    da.set_at_index(2, 'three')
+    assert buffer == [1, 'two', 'three']
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES, ids=['oa', 'oa_soa', 'sc', 'sc_compact'])
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+def test_checked_access_finds_the_same_values(map_class, function):
+    hash_map = map_class(11, function)
+    expected = run_against_dict(hash_map, 14, resize=False)
+    keys = ['key' + str(i) for i in range(400)]
+    values = [expected.get(key) for key in keys]
+    found = [key in expected for key in keys]
+
+    # The lookups that bench.probes times, read through the raw buffers and
+    # through the checked [].
+    for access in (contextlib.nullcontext, _checked_access):
+        with access():
+            assert [hash_map.get(key) for key in keys] == values
+            assert [hash_map.contains_key(key) for key in keys] == found
+            assert hash_map.get_many(keys) == values
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES[:2], ids=['oa', 'oa_soa'])
+def test_checked_access_iterates_the_same_entries(map_class):
+    hash_map = map_class(11, HASH_FUNCTIONS[2])
+    expected = run_against_dict(hash_map, 15, resize=False)
+    with _checked_access():
+        assert {entry.key: entry.value for entry in hash_map} == expected
+
+
+def test_checked_access_restores_the_raw_buffers_on_error():
+    with pytest.raises(RuntimeError):
+        with _checked_access():
+            assert hash_map_oa.raw_buffer is not raw_buffer
+            raise RuntimeError
+    assert hash_map_oa.raw_buffer is raw_buffer
+    assert hash_map_sc.raw_buffer is raw_buffer
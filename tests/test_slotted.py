@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import (DynamicArray, HashEntry, LinkedList, SLNode, SlottedDynamicArray,
+                        SlottedHashEntry, SlottedLinkedList, SlottedSLNode, SlottedSortedBucket,
+                        SortedBucket)
+from bench.memory import report
+from tests.differential import (HASH_FUNCTIONS, contents, run_against_dict,
+                                run_batches_against_dict)
+
+SLOTTED_TYPES = [
+    (DynamicArray, SlottedDynamicArray),
+    (SLNode, SlottedSLNode),
+    (LinkedList, SlottedLinkedList),
+    (SortedBucket, SlottedSortedBucket),
+    (HashEntry, SlottedHashEntry),
+]
+
+
+@pytest.mark.parametrize('plain, slotted', SLOTTED_TYPES)
+def test_slotted_types_are_separate_plain_classes(plain, slotted):
+    assert type(slotted) is type
+    assert not issubclass(slotted, plain) and not issubclass(plain, slotted)
+    assert '__dict__' not in dir(slotted)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('modes', [{}, {'incremental': True, 'lazy_clear': True},
+                                   {'treeify': True, 'access_policy': 'transpose'}])
+def test_sc_slotted_matches_dict(function, modes):
+    for run in (run_against_dict, run_batches_against_dict):
+        run(hash_map_sc.HashMap(11, function, slotted=True, **modes), 13)
+
+
+@pytest.mark.parametrize('function', HASH_FUNCTIONS)
+@pytest.mark.parametrize('modes', [{}, {'incremental': True, 'lazy_clear': True},
+                                   {'shrink': True, 'pow2': True}])
+def test_oa_slotted_matches_dict(function, modes):
+    for run in (run_against_dict, run_batches_against_dict):
+        run(hash_map_oa.HashMap(11, function, slotted=True, **modes), 13)
+
+
+def test_sc_slotted_storage():
+    # Anagrams share their hash_function_1 bucket, which gets treeified.
+    keys = [''.join(p) for p in itertools.islice(itertools.permutations('abcdefg'), 50)]
+    hash_map = hash_map_sc.HashMap(11, HASH_FUNCTIONS[0], treeify=True, slotted=True)
+    for i, key in enumerate(keys):
+        hash_map.put(key, i)
+    assert type(hash_map._buckets) is SlottedDynamicArray
+    buckets = [hash_map._buckets[i] for i in range(hash_map.get_capacity())]
+    assert {type(bucket) for bucket in buckets} == {SlottedLinkedList, SlottedSortedBucket}
+    assert all(type(node) is SlottedSLNode for bucket in buckets for node in bucket)
+    assert contents(hash_map) == {key: i for i, key in enumerate(keys)}
+
+
+def test_oa_slotted_storage():
+    hash_map = hash_map_oa.HashMap(11, HASH_FUNCTIONS[2], slotted=True)
+    for i in range(100):
+        hash_map.put('key' + str(i), i)
+    assert type(hash_map._buckets) is SlottedDynamicArray
+    entries = [hash_map._buckets[i] for i in range(hash_map.get_capacity())]
+    assert {type(entry) for entry in entries if entry is not None} == {SlottedHashEntry}
+
+
+def test_slotted_maps_take_less_memory():
+    rows = report(['sc', 'sc_slotted', 'oa', 'oa_slotted'], [2000])
+    per_key = {row['map']: row['bytes_per_key'] for row in rows}
+    assert per_key['sc_slotted'] < per_key['sc']
+    assert per_key['oa_slotted'] < per_key['oa']